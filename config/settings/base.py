@@ -1,57 +1,64 @@
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any
 import yaml
 
 # Build paths
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 CONFIG_DIR = BASE_DIR / "config"
 DATA_DIR = BASE_DIR / "data"
 LOGS_DIR = BASE_DIR / "logs"
 
-# Create directories
-DATA_DIR.mkdir(exist_ok=True)
-LOGS_DIR.mkdir(exist_ok=True)
+# ${NAME} or ${NAME:default}
+ENV_PLACEHOLDER = re.compile(r"\$\{(\w+)(?::([^}]*))?\}")
 
+# libyaml's loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
+
+def _substitute_env(match: "re.Match") -> str:
+    name, default = match.group(1), match.group(2)
+    value = os.environ.get(name)
+    if value is not None:
+        return value
+    return default if default is not None else match.group(0)
+
+
+@lru_cache(maxsize=None)
 def load_yaml_config(filename: str) -> Dict[str, Any]:
-    """Load YAML configuration file"""
+    """
+    Load a YAML configuration file, replacing ${NAME} and ${NAME:default}
+    with environment variables. Parsed once per process; callers must not
+    mutate the result.
+    """
     config_path = CONFIG_DIR / filename
     if config_path.exists():
         with open(config_path, 'r') as f:
-            content = f.read()
-            # Replace environment variables
-            for key, value in os.environ.items():
-                content = content.replace(f'${{{key}}}', value)
-                content = content.replace(f'${{{key}:', f'${{{value}:')
-            return yaml.safe_load(content)
+            content = ENV_PLACEHOLDER.sub(_substitute_env, f.read())
+            return yaml.load(content, Loader=YamlLoader) or {}
     return {}
 
 
-# Load configurations
-try:
-    DATABASE_CONFIG = load_yaml_config("database_config.yaml")
-except Exception as e:
-    print(f"Warning: Could not load database_config.yaml: {e}")
-    DATABASE_CONFIG = {}
-
-try:
-    MODEL_CONFIG = load_yaml_config("model_config.yaml")
-except Exception as e:
-    print(f"Warning: Could not load model_config.yaml: {e}")
-    MODEL_CONFIG = {}
-
-# try:
-#     PROMPT_TEMPLATES = load_yaml_config("prompt_templates.yaml")
-# except Exception as e:
-#     print(f"Warning: Could not load prompt_templates.yaml: {e}")
-#     PROMPT_TEMPLATES = {}
-
-try:
-    LOGGING_CONFIG = load_yaml_config("logging_config.yaml")
-except Exception as e:
-    print(f"Warning: Could not load logging_config.yaml: {e}")
-    LOGGING_CONFIG = {}
+# Configurations are loaded on first access (e.g. `from config.settings.base
+# import DATABASE_CONFIG`), so importing this module reads no files
+_LAZY_CONFIGS = {
+    "DATABASE_CONFIG": "database_config.yaml",
+    "MODEL_CONFIG": "model_config.yaml",
+    "LOGGING_CONFIG": "logging_config.yaml",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_CONFIGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        return load_yaml_config(_LAZY_CONFIGS[name])
+    except Exception as e:
+        print(f"Warning: Could not load {_LAZY_CONFIGS[name]}: {e}")
+        return {}
+
 
 # Environment
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
@@ -1,6 +1,7 @@
 """Development settings"""
 import os
 from config.settings.base import *
+from config.settings.base import DATABASE_CONFIG, MODEL_CONFIG
 
 DEBUG = True
 
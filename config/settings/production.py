@@ -1,5 +1,6 @@
 """Production settings"""
 from config.settings.base import *
+from config.settings.base import DATABASE_CONFIG, MODEL_CONFIG
 
 DEBUG = False
 
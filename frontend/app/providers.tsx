@@ -1,8 +1,26 @@
 'use client';
 
-import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
+import { QueryClient, QueryClientProvider, useQueryClient } from '@tanstack/react-query';
 import { ReactQueryDevtools } from '@tanstack/react-query-devtools';
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
+
+const TASK_EVENTS_URL = `${process.env.NEXT_PUBLIC_API_URL}/api/v1/AI%20Tasks/events`;
+
+// Refetch task queries when the server pushes a change, instead of polling
+function TaskEventsSubscriber() {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    const source = new EventSource(TASK_EVENTS_URL);
+    const invalidate = () => queryClient.invalidateQueries({ queryKey: ['tasks'] });
+    ['created', 'updated', 'step_toggled', 'deleted', 'bulk', 'resync'].forEach((type) =>
+      source.addEventListener(type, invalidate)
+    );
+    return () => source.close();
+  }, [queryClient]);
+
+  return null;
+}
 
 export function Providers({ children }: { children: React.ReactNode }) {
   const [queryClient] = useState(
@@ -19,6 +37,7 @@ export function Providers({ children }: { children: React.ReactNode }) {
 
   return (
     <QueryClientProvider client={queryClient}>
+      <TaskEventsSubscriber />
       {children}
       <ReactQueryDevtools initialIsOpen={false} />
     </QueryClientProvider>
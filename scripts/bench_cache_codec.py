@@ -0,0 +1,74 @@
+"""
+Microbenchmark of RedisCache value codecs.
+
+Encodes and decodes one cached task list page (the JSON form served by
+GET /tasks) with the JSON codec and the msgpack codec, reporting time per
+round trip through the codec and the stored size. No Redis is needed.
+
+    python scripts/bench_cache_codec.py --page-size 100 --steps 5
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.cache.codecs import JsonCodec, MsgpackCodec  # noqa: E402
+
+
+def make_page(page_size: int, steps: int) -> dict:
+    now = datetime.utcnow().isoformat()
+    tasks = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Task {i}",
+            "description": "Prepare the quarterly report and circulate it for review " * 2,
+            "priority": "high",
+            "category": "work",
+            "is_completed": False,
+            "created_at": now,
+            "completed_at": None,
+            "is_archived": False,
+            "steps": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "description": f"Step {j} of the task",
+                    "order_index": j,
+                    "is_completed": j % 2 == 0
+                }
+                for j in range(steps)
+            ]
+        }
+        for i in range(page_size)
+    ]
+    return {"tasks": tasks, "total": 1000, "page": 1, "page_size": page_size}
+
+
+def measure(label: str, codec, value, iterations: int) -> None:
+    encoded = codec.encode(value)
+    assert codec.decode(encoded) == value
+    start = time.process_time()
+    for _ in range(iterations):
+        codec.decode(codec.encode(value))
+    elapsed = time.process_time() - start
+    print(f"{label:<16} {elapsed / iterations * 1e6:9.1f} us/round trip  {len(encoded) / 1024:8.1f} KiB stored")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    
+    page = make_page(args.page_size, args.steps)
+    measure("json", JsonCodec(), page, args.iterations)
+    measure("msgpack", MsgpackCodec(compress_min_bytes=1 << 30), page, args.iterations)
+    measure("msgpack+compress", MsgpackCodec(), page, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
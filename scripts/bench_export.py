@@ -0,0 +1,106 @@
+"""
+Benchmark the streaming task export against a running API.
+
+Reports time to first byte, rows/s and MB/s. With --pid, also samples the
+API process RSS during the export to confirm memory stays flat. With
+--check-import, every NDJSON line is also validated as /import input
+(TaskCreate), and the script fails if any line would be rejected.
+
+    python scripts/bench_export.py --format ndjson --pid $(pgrep -f uvicorn | head -1)
+    python scripts/bench_export.py --check-import
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def read_rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class ImportCheck:
+    """Validates streamed NDJSON lines the way POST /import parses them"""
+    
+    def __init__(self):
+        sys.path.insert(0, str(ROOT))
+        from src.schemas.task import TaskCreate
+        self.schema = TaskCreate
+        self.pending = b""
+        self.checked = 0
+        self.errors = []
+    
+    def feed(self, chunk: bytes) -> None:
+        *lines, self.pending = (self.pending + chunk).split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            self.checked += 1
+            try:
+                self.schema.model_validate(json.loads(line))
+            except ValueError as e:
+                self.errors.append((self.checked, str(e)))
+    
+    def finish(self) -> None:
+        self.feed(b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/AI Tasks/export")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--pid", type=int, help="API process id to sample RSS from")
+    parser.add_argument("--check-import", action="store_true",
+                        help="validate every NDJSON line as /import input")
+    args = parser.parse_args()
+    if args.check_import and args.format != "ndjson":
+        parser.error("--check-import needs --format ndjson")
+    import_check = ImportCheck() if args.check_import else None
+
+    start = time.perf_counter()
+    first_byte = None
+    total_bytes = 0
+    lines = 0
+    rss_samples = []
+
+    with httpx.stream("GET", args.url, params={"format": args.format}, timeout=None) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            total_bytes += len(chunk)
+            lines += chunk.count(b"\n")
+            if import_check:
+                import_check.feed(chunk)
+            if args.pid:
+                rss_samples.append(read_rss_mb(args.pid))
+
+    elapsed = time.perf_counter() - start
+    rows = lines - 1 if args.format == "csv" else lines
+    print(f"format:        {args.format}")
+    print(f"rows:          {rows}")
+    print(f"bytes:         {total_bytes / 1e6:.1f} MB")
+    print(f"time to first: {(first_byte or 0) * 1000:.1f} ms")
+    print(f"elapsed:       {elapsed:.2f} s")
+    print(f"throughput:    {rows / elapsed:,.0f} rows/s, {total_bytes / 1e6 / elapsed:.1f} MB/s")
+    if rss_samples:
+        print(f"server RSS:    min {min(rss_samples):.1f} MB, max {max(rss_samples):.1f} MB")
+    if import_check:
+        import_check.finish()
+        print(f"import check:  {import_check.checked - len(import_check.errors)}/{import_check.checked} lines valid")
+        for line_number, error in import_check.errors[:10]:
+            print(f"  line {line_number}: {error}")
+        if import_check.errors:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
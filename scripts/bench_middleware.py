@@ -0,0 +1,112 @@
+"""
+Benchmark the per-request overhead of the middleware stack.
+
+Drives the ASGI app in-process (no sockets) with many concurrent requests
+and compares three stacks around the same trivial endpoint:
+
+    none      - the bare application
+    legacy    - three pass-through BaseHTTPMiddleware layers (the old design)
+    asgi      - ErrorHandlerMiddleware + AuthMiddleware (+ RateLimiterMiddleware
+                with --rate-limit, which needs Redis)
+
+    python scripts/bench_middleware.py --requests 20000 --concurrency 200
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import PlainTextResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from src.api.middleware.auth import AuthMiddleware  # noqa: E402
+from src.api.middleware.error_handler import ErrorHandlerMiddleware  # noqa: E402
+from src.api.middleware.rate_limiter import RateLimiterMiddleware  # noqa: E402
+
+
+async def ping(request):
+    return PlainTextResponse("ok")
+
+
+class LegacyPassThrough(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_app(stack: str, rate_limit: bool):
+    app = Starlette(routes=[Route("/ping", ping)])
+    if stack == "legacy":
+        for _ in range(3):
+            app.add_middleware(LegacyPassThrough)
+    elif stack == "asgi":
+        if rate_limit:
+            app.add_middleware(RateLimiterMiddleware)
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(ErrorHandlerMiddleware)
+    return app
+
+
+async def call(app, scope):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        pass
+    
+    await app(dict(scope), receive, send)
+
+
+async def run(app, requests: int, concurrency: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"authorization", b"Bearer invalid")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        async with semaphore:
+            await call(app, scope)
+    
+    # Warm up
+    await asyncio.gather(*(one() for _ in range(min(requests, 500))))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rate-limit", action="store_true", help="include the Redis rate limiter")
+    args = parser.parse_args()
+    
+    baseline = None
+    for stack in ("none", "legacy", "asgi"):
+        elapsed = asyncio.run(run(build_app(stack, args.rate_limit), args.requests, args.concurrency))
+        per_request = elapsed / args.requests * 1e6
+        if baseline is None:
+            baseline = per_request
+        print(
+            f"{stack:<8} {args.requests / elapsed:10.0f} req/s  {per_request:7.1f} us/request  "
+            f"overhead {per_request - baseline:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Measure rate limiter overhead at a fixed request rate (needs Redis).
+
+Paces limiter checks at --rps for --seconds, spread over --clients
+identities, and reports per-check latency percentiles and how many checks
+reached Redis. Runs the previous GET + SET/INCR limiter first for comparison.
+
+With --workers, instead checks that leases do not over-deny: that many
+limiters (one per simulated worker process, each with its own local tier)
+share one bucket and are sent requests at random intervals averaging
+--load of the limit. Any denial below the limit fails the check.
+
+    python scripts/bench_rate_limit.py --rps 5000 --seconds 10 --clients 50
+    python scripts/bench_rate_limit.py --workers 8 --load 0.5 --limit 100/10 --seconds 60
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.cache.rate_limit import RateLimit, RateLimiter  # noqa: E402
+from src.infrastructure.cache.redis import RedisCache  # noqa: E402
+
+
+class LegacyLimiter:
+    """The limiter this replaced: two round trips and not atomic"""
+    
+    def __init__(self, cache: RedisCache):
+        self.cache = cache
+        self.redis_calls = 0
+    
+    async def hit(self, limits):
+        key, limit = limits[0]
+        self.redis_calls += 2
+        current = await self.cache.get(key)
+        if current is None:
+            await self.cache.set(key, 1, ttl=int(limit.period))
+        elif int(current) >= limit.requests:
+            return False
+        else:
+            await self.cache.increment(key)
+        return True
+
+
+class CountingCache(RedisCache):
+    redis_calls = 0
+    
+    async def run_script(self, script, keys, args):
+        self.redis_calls += 1
+        return await super().run_script(script, keys, args)
+
+
+async def drive(limiter, label: str, prefix: str, redis_calls, rps: int, seconds: float, clients: int, limit: RateLimit):
+    latencies = []
+    interval = 1 / rps
+    total = int(rps * seconds)
+    
+    async def one(i: int):
+        key = f"bench:{prefix}:{i % clients}"
+        start = time.perf_counter()
+        await limiter.hit([(key, limit)])
+        latencies.append(time.perf_counter() - start)
+    
+    tasks = []
+    start = time.perf_counter()
+    for i in range(total):
+        # Open-loop pacing: schedule on time whether or not earlier checks finished
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<8} {total / elapsed:8.0f} checks/s  "
+        f"p50 {quantiles[49] * 1e6:7.0f} us  p99 {quantiles[98] * 1e6:7.0f} us  "
+        f"redis calls {redis_calls()}/{total}"
+    )
+
+
+async def check_workers(workers: int, load: float, seconds: float, limit: RateLimit) -> bool:
+    """Whether `workers` limiters on one bucket allow every request at `load` of the limit"""
+    cache = CountingCache()
+    limiters = [RateLimiter(cache) for _ in range(workers)]
+    key = f"bench:workers{int(time.time())}"
+    rate = limit.requests / limit.period * load
+    
+    checks = denied = 0
+    start = time.perf_counter()
+    next_at = start
+    while next_at - start < seconds:
+        # Poisson arrivals, each routed to a random worker like a load balancer would
+        next_at += random.expovariate(rate)
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result = await random.choice(limiters).hit([(key, limit)])
+        checks += 1
+        denied += not result.allowed
+    
+    print(
+        f"workers {workers}  load {load:.0%}  checks {checks}  denied {denied}  "
+        f"redis calls {cache.redis_calls}/{checks}"
+    )
+    return denied == 0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rps", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--limit", default="1000/60", help="per-client limit, requests/seconds")
+    parser.add_argument("--workers", type=int, help="check for over-denial across this many workers")
+    parser.add_argument("--load", type=float, default=0.5, help="request rate as a fraction of the limit")
+    args = parser.parse_args()
+    limit = RateLimit.parse(args.limit)
+    run = int(time.time())
+    
+    if args.workers:
+        if args.load >= 1:
+            parser.error("--load must be below 1 to expect no denials")
+        if not await check_workers(args.workers, args.load, args.seconds, limit):
+            sys.exit(1)
+        return
+    
+    legacy = LegacyLimiter(RedisCache())
+    await drive(
+        legacy, "legacy", f"legacy{run}", lambda: legacy.redis_calls,
+        args.rps, args.seconds, args.clients, limit
+    )
+    limiter = RateLimiter(CountingCache())
+    await drive(
+        limiter, "gcra", f"gcra{run}", lambda: limiter.cache.redis_calls,
+        args.rps, args.seconds, args.clients, limit
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
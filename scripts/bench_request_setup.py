@@ -0,0 +1,77 @@
+"""
+Microbenchmark of per-request service construction.
+
+Compares building a TaskService the old way (a new analyzer, OpenAI client
+and HTTP pool per request) with building it from the application-scoped
+Container. Reports time and bytes allocated per request. No database or
+network access is needed; sessions are never used.
+
+    python scripts/bench_request_setup.py --iterations 2000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.api.container import Container  # noqa: E402
+from src.infrastructure.database.postgres_client import SessionLocal  # noqa: E402
+from src.infrastructure.llm.providers.openai_client import OpenAIClient  # noqa: E402
+from src.services.task_analyzer import TaskAnalyzerService  # noqa: E402
+from src.services.task_service import TaskService  # noqa: E402
+
+
+def measure(label: str, build, iterations: int) -> None:
+    # Warm up imports and lazy initialisation
+    for _ in range(10):
+        build()
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    for _ in range(min(iterations, 200)):
+        build()
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(
+        stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, "filename")
+        if stat.size_diff > 0
+    )
+    
+    print(
+        f"{label:<12} {elapsed / iterations * 1e6:9.1f} us/request  "
+        f"{allocated / min(iterations, 200) / 1024:8.1f} KiB retained+allocated/request"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    
+    container = Container()
+    
+    def per_request():
+        db = SessionLocal()
+        TaskService(db, analyzer=TaskAnalyzerService(llm_client=OpenAIClient()))
+        db.close()
+    
+    def from_container():
+        db = SessionLocal()
+        container.task_service(db)
+        db.close()
+    
+    measure("before", per_request, args.iterations)
+    measure("container", from_container, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Microbenchmark of list response serialization.
+
+Compares the CPU time to turn one page of task rows into response bytes via
+the pydantic path (Task.from_orm, response_model re-validation, stdlib json)
+with the fast path (task_to_dict + orjson). Rows are plain objects with the
+ORM attribute names, so no database is needed.
+
+    python scripts/bench_serialization.py --page-size 100 --steps 5
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from src.schemas.task import Task, TaskListResponse, task_to_dict  # noqa: E402
+
+
+def make_rows(page_size: int, steps: int):
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            title=f"Task {i}",
+            description="Prepare the quarterly report and circulate it for review " * 2,
+            priority="high",
+            category="work",
+            source_text=None,
+            is_completed=False,
+            created_at=now,
+            completed_at=None,
+            is_archived=False,
+            steps=[
+                SimpleNamespace(
+                    id=uuid.uuid4(),
+                    description=f"Step {j} of the task",
+                    order_index=j,
+                    is_completed=j % 2 == 0
+                )
+                for j in range(steps)
+            ]
+        )
+        for i in range(page_size)
+    ]
+
+
+def before(rows, response_adapter):
+    response = TaskListResponse(
+        tasks=[Task.from_orm(row) for row in rows],
+        total=1000,
+        page=1,
+        page_size=len(rows)
+    )
+    # What FastAPI does with a response_model: validate, dump, json.dumps
+    content = response_adapter.dump_python(response_adapter.validate_python(response), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def after(rows, response_adapter):
+    return orjson.dumps({
+        "tasks": [task_to_dict(row) for row in rows],
+        "total": 1000,
+        "page": 1,
+        "page_size": len(rows)
+    })
+
+
+def measure(label: str, serialize, rows, iterations: int) -> float:
+    adapter = TypeAdapter(TaskListResponse)
+    serialize(rows, adapter)
+    start = time.process_time()
+    for _ in range(iterations):
+        serialize(rows, adapter)
+    per_page = (time.process_time() - start) / iterations
+    print(f"{label:<8} {per_page * 1e3:8.3f} ms CPU/page")
+    return per_page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    
+    rows = make_rows(args.page_size, args.steps)
+    adapter = TypeAdapter(TaskListResponse)
+    # Both paths must produce the same document
+    assert json.loads(before(rows, adapter)) == json.loads(after(rows, adapter))
+    
+    slow = measure("before", before, rows, args.iterations)
+    fast = measure("after", after, rows, args.iterations)
+    print(f"speedup  {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Fail when cold start gets slower than a budget.
+
+Starts fresh interpreters (FAST_START=true, so no database is needed) and
+measures how long `import src.main` takes and how long it takes from
+interpreter start until the first request to / has been answered, startup
+hook included. Keeps the best of --runs attempts. Exits with status 1 and
+lists the slowest top-level imports when a budget is exceeded, so it can run
+as a CI step:
+
+    python scripts/check_startup_budget.py --import-budget 1.5 --first-request-budget 2.5
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter: import the app, then drive the ASGI lifespan
+# and one GET / in-process (no server, no sockets)
+PROBE = r'''
+import asyncio, json, time
+start = time.perf_counter()
+from src.main import app
+imported = time.perf_counter()
+
+async def first_request():
+    lifespan_messages = asyncio.Queue()
+    await lifespan_messages.put({"type": "lifespan.startup"})
+    started = asyncio.Event()
+    
+    async def lifespan_send(message):
+        if message["type"].startswith("lifespan.startup"):
+            started.set()
+    
+    lifespan = asyncio.create_task(app(
+        {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}},
+        lifespan_messages.get,
+        lifespan_send
+    ))
+    await started.wait()
+    
+    status = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+    
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    await app(scope, receive, send)
+    answered = time.perf_counter()
+    
+    await lifespan_messages.put({"type": "lifespan.shutdown"})
+    await lifespan
+    return status[0], answered
+
+status, answered = asyncio.run(first_request())
+print(json.dumps({"import": imported - start, "first_request": answered - start, "status": status}))
+'''
+
+
+def run_probe(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=env["STARTUP_CHECK_DIR"], env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Startup probe failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, limit: int = 15) -> list:
+    """Modules imported by src.main directly, by cumulative import time (python -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=env["STARTUP_CHECK_DIR"], env=env, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting is shown by two spaces of indentation per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget", type=float, default=1.5, help="seconds")
+    parser.add_argument("--first-request-budget", type=float, default=2.5, help="seconds")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    
+    # Children run in a scratch directory so the log files they write (paths
+    # relative to the working directory) stay out of the working tree
+    workdir = tempfile.mkdtemp(prefix="startup-check-")
+    env = dict(
+        os.environ,
+        FAST_START="true",
+        STARTUP_CHECK_DIR=workdir,
+        PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))
+    )
+    env.setdefault("OPENAI_API_KEY", "sk-startup-check")
+    try:
+        check(args, env)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def check(args: argparse.Namespace, env: dict) -> None:
+    samples = [run_probe(env) for _ in range(args.runs)]
+    import_time = min(sample["import"] for sample in samples)
+    first_request = min(sample["first_request"] for sample in samples)
+    
+    print(f"import src.main      {import_time:6.3f}s  (budget {args.import_budget:.3f}s)")
+    print(f"first request        {first_request:6.3f}s  (budget {args.first_request_budget:.3f}s)")
+    if samples[0]["status"] != 200:
+        sys.exit(f"GET / answered {samples[0]['status']}")
+    
+    if import_time > args.import_budget or first_request > args.first_request_budget:
+        print("\nOver budget. Slowest top-level imports (cumulative):")
+        for microseconds, name in slowest_imports(env):
+            print(f"  {microseconds / 1000:8.1f} ms  {name}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
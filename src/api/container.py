@@ -0,0 +1,63 @@
+from sqlalchemy.orm import Session
+
+from src.infrastructure.cache.redis import RedisCache
+from src.services.health import HealthChecker
+from src.services.task_analyzer import TaskAnalyzerService
+from src.services.task_cache import TaskCache
+from src.services.task_events import TaskChangeFeed
+from src.services.task_import import TaskImportService
+from src.services.task_batch import TaskBatchService
+from src.services.idempotency import IdempotencyStore
+from src.services.task_service import TaskService
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Container:
+    """
+    Application-scoped dependencies.
+    
+    Created once in the lifespan hook and stored on app.state. Holds the
+    long-lived, stateless clients and services; request-scoped objects that
+    need a DB session are built from them by the factory methods.
+    """
+    
+    def __init__(self):
+        self.redis = RedisCache()
+        # Creates its OpenAI client on first use
+        self.analyzer = TaskAnalyzerService()
+        self.task_cache = TaskCache(self.redis)
+        self.task_events = TaskChangeFeed(self.redis)
+        self.idempotency = IdempotencyStore(self.redis)
+        self.health = HealthChecker(self.redis)
+    
+    def task_service(self, db: Session) -> TaskService:
+        return TaskService(
+            db,
+            analyzer=self.analyzer,
+            cache=self.task_cache,
+            events=self.task_events
+        )
+    
+    def task_import_service(self, db: Session) -> TaskImportService:
+        return TaskImportService(
+            db,
+            analyzer=self.analyzer,
+            cache=self.task_cache,
+            checkpoints=self.redis,
+            events=self.task_events
+        )
+    
+    def task_batch_service(self, db: Session) -> TaskBatchService:
+        return TaskBatchService(self, db)
+    
+    async def close(self) -> None:
+        """Release connections held by the long-lived clients"""
+        try:
+            await self.health.close()
+            await self.task_events.close()
+            await self.analyzer.close()
+            await self.redis.disconnect()
+        except Exception as e:
+            logger.error("Error closing application container: %s", e)
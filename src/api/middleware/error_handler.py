@@ -1,16 +1,19 @@
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from src.core.logging import get_logger
 from src.core.exceptions import AppException
 
 logger = get_logger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """Global error handler middleware"""
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Global error handler middleware
 
@@ -32,13 +35,30 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         If the exception is an instance of AppException, the status code and
         error format is taken from the exception. Otherwise, a 500 status code
         is returned with a generic error message.
+
+        Implemented as a plain ASGI middleware so responses (including
+        streaming ones) pass through untouched. Once the response has started
+        an error can no longer be turned into a JSON body and is re-raised.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except AppException as e:
-            logger.error(f"Application error: {str(e)}")
-            return JSONResponse(
+            logger.error("Application error: %s", e)
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=e.status_code,
                 content={
                     "error": e.error_code,
@@ -46,12 +66,16 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     "details": e.details
                 }
             )
+            await response(scope, receive, send)
         except Exception as e:
-            logger.exception(f"Unhandled error: {str(e)}")
-            return JSONResponse(
+            logger.exception("Unhandled error: %s", e)
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "error": "INTERNAL_SERVER_ERROR",
                     "message": "An unexpected error occurred"
                 }
-            )
\ No newline at end of file
+            )
+            await response(scope, receive, send)
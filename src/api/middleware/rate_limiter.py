@@ -1,47 +1,74 @@
-from fastapi import Request, status
+from typing import List, Tuple
+import math
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from src.infrastructure.cache.redis import RedisCache
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.infrastructure.cache.rate_limit import RateLimit, RateLimiter
 from src.core.config import settings
-import time
 
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using Redis"""
+class RateLimiterMiddleware:
+    """
+    Rate limiting middleware using Redis (plain ASGI).
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.cache = RedisCache()
-        self.requests_limit = settings.RATE_LIMIT_REQUESTS
-        self.period = settings.RATE_LIMIT_PERIOD
+    Requests are limited per user when AuthMiddleware has verified a bearer
+    token (add this middleware before AuthMiddleware so it runs inside it),
+    otherwise per client IP. Every request counts against the default limit,
+    plus any RATE_LIMIT_ROUTES rule matching its method and path.
+    """
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for health checks
-        if request.url.path == "/api/v1/health":
-            return await call_next(request)
-        
-        # Get client IP
-        client_ip = request.client.host
-        key = f"rate_limit:{client_ip}"
-        
-        # Get current request count
-        current_count = await self.cache.get(key)
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter(
+            lease_fraction=settings.RATE_LIMIT_LOCAL_FRACTION,
+            lease_seconds=settings.RATE_LIMIT_LEASE_SECONDS
+        )
+        self.default_limit = RateLimit(settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_PERIOD)
+        self.route_limits: List[Tuple[str, str, RateLimit]] = []
+        for rule, spec in settings.RATE_LIMIT_ROUTES.items():
+            method, path = rule.split(" ", 1)
+            self.route_limits.append((method.upper(), path, RateLimit.parse(spec)))
+    
+    @staticmethod
+    def _identity(scope: Scope) -> str:
+        claims = scope.get("state", {}).get("token_claims")
+        if claims:
+            if claims.get("sub"):
+                return f"user:{claims['sub']}"
+            if claims.get("jti"):
+                return f"token:{claims['jti']}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+    
+    def _limits(self, scope: Scope) -> List[Tuple[str, RateLimit]]:
+        identity = self._identity(scope)
+        limits = [(f"rate_limit:{identity}", self.default_limit)]
+        for method, path, limit in self.route_limits:
+            if method in ("*", scope["method"]) and scope["path"].startswith(path):
+                limits.append((f"rate_limit:{identity}:{method} {path}", limit))
+        return limits
+    
+    # Probes and scrapes must never be throttled
+    EXEMPT_PATHS = ("/api/v1/health", "/metrics")
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Skip rate limiting for non-HTTP traffic, health checks and metrics
+        if scope["type"] != "http" or scope["path"].startswith(self.EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
         
-        if current_count is None:
-            # First request
-            await self.cache.set(key, 1, ttl=self.period)
-        elif int(current_count) >= self.requests_limit:
+        result = await self.limiter.hit(self._limits(scope))
+        if not result.allowed:
             # Rate limit exceeded
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": "RATE_LIMIT_EXCEEDED",
-                    "message": f"Rate limit exceeded. Please try again later."
-                }
+                    "message": "Rate limit exceeded. Please try again later."
+                },
+                headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))}
             )
-        else:
-            # Increment counter
-            await self.cache.increment(key)
+            await response(scope, receive, send)
+            return
         
-        response = await call_next(request)
-        return response
\ No newline at end of file
+        await self.app(scope, receive, send)
@@ -0,0 +1,20 @@
+"""
+Response classes shared by the endpoints.
+"""
+from typing import Any
+import time
+
+from fastapi.responses import ORJSONResponse
+
+from src.core.tracing import record_span
+
+
+class TracedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that reports its encoding time as the "serialization" span"""
+    
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        try:
+            return super().render(content)
+        finally:
+            record_span("serialization", time.perf_counter() - start)
@@ -1,10 +1,15 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.requests import HTTPConnection
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
 
-from src.infrastructure.database.postgres_client import SessionLocal
+from src.infrastructure.database.postgres_client import SessionLocal, get_read_session
+from src.api.container import Container
+from src.services.task_service import TaskService
+from src.services.task_import import TaskImportService
+from src.services.task_batch import TaskBatchService
+from src.services.idempotency import IdempotencyStore
 from src.core.config import settings
 from src.core.security import verify_token
 
@@ -12,6 +17,10 @@ from src.core.security import verify_token
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
+# Set on responses to write requests; while present, the client's reads go to
+# the primary so it always sees its own writes even if the replica lags.
+PRIMARY_STICKY_COOKIE = "db_primary_sticky"
+
 #
 def get_db() -> Generator:
     """
@@ -24,6 +33,106 @@ def get_db() -> Generator:
         db.close()
 
 
+def get_write_db(response: Response) -> Generator:
+    """
+    Primary database dependency for endpoints that write.
+    Pins the client's subsequent reads to the primary for a short window.
+    """
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE,
+        "1",
+        max_age=settings.DATABASE_READ_STICKY_SECONDS,
+        httponly=True,
+        samesite="lax"
+    )
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request) -> Generator:
+    """
+    Read-only database dependency.
+    Served by the replica unless the client wrote recently or the replica is
+    down or lagging.
+    """
+    db = get_read_session(
+        prefer_primary=request.cookies.get(PRIMARY_STICKY_COOKIE) is not None
+    )
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_container(connection: HTTPConnection) -> Container:
+    """
+    Application-scoped dependency container (created in the lifespan hook).
+    Takes the connection rather than the request so WebSocket routes can use it.
+    """
+    return connection.app.state.container
+
+
+def get_task_service(
+    db: Session = Depends(get_write_db),
+    container: Container = Depends(get_container)
+) -> TaskService:
+    """
+    Request-scoped task service on the primary database
+    """
+    return container.task_service(db)
+
+
+def get_primary_task_service(
+    db: Session = Depends(get_db),
+    container: Container = Depends(get_container)
+) -> TaskService:
+    """
+    Request-scoped task service on the primary database, for reads that
+    must never lag behind writes
+    """
+    return container.task_service(db)
+
+
+def get_read_task_service(
+    db: Session = Depends(get_read_db),
+    container: Container = Depends(get_container)
+) -> TaskService:
+    """
+    Request-scoped task service for read-only endpoints
+    """
+    return container.task_service(db)
+
+
+def get_task_import_service(
+    db: Session = Depends(get_write_db),
+    container: Container = Depends(get_container)
+) -> TaskImportService:
+    """
+    Request-scoped task import service
+    """
+    return container.task_import_service(db)
+
+
+def get_task_batch_service(
+    db: Session = Depends(get_write_db),
+    container: Container = Depends(get_container)
+) -> TaskBatchService:
+    """
+    Request-scoped batch executor (writes on the primary)
+    """
+    return container.task_batch_service(db)
+
+
+def get_idempotency_store(container: Container = Depends(get_container)) -> IdempotencyStore:
+    """
+    Shared Idempotency-Key store
+    """
+    return container.idempotency
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
@@ -34,6 +143,7 @@ async def get_current_user(
     if not credentials:
         return None
     
+    from jose import JWTError
     try:
         payload = verify_token(credentials.credentials)
         return payload
@@ -57,4 +167,15 @@ async def require_auth(
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def require_admin(current_user: dict = Depends(require_auth)) -> dict:
+    """
+    Require a token carrying the admin role
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin role required"
+        )
+    return current_user
@@ -0,0 +1,34 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.api.v1.deps import require_admin
+from src.core.config import settings
+from src.core.profiler import profiler
+from src.core.tracing import slow_requests
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def collect_profile(
+    seconds: float = Query(default=10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(default=10, ge=1, le=1000)
+):
+    """
+    Sample every thread of this worker for `seconds` and return the stacks in
+    collapsed format (feed to flamegraph.pl or speedscope). Only one profile
+    runs at a time per worker.
+    """
+    stacks = await run_in_threadpool(profiler.profile, seconds, interval_ms / 1000)
+    return PlainTextResponse(stacks)
+
+
+@router.get("/slow-requests")
+def list_slow_requests() -> List[dict]:
+    """
+    Recent requests slower than SLOW_REQUEST_THRESHOLD_MS on this worker,
+    newest first, with time spent in DB, Redis, LLM and serialization
+    """
+    return slow_requests.entries()
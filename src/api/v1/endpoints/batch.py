@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from src.api.v1.deps import get_task_batch_service
+from src.services.task_batch import TaskBatchService
+from src.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter()
+
+
+@router.post("", response_model=BatchResponse)
+async def execute_batch(
+    batch: BatchRequest,
+    service: TaskBatchService = Depends(get_task_batch_service)
+):
+    """
+    Execute several task operations in one round trip.
+    Results are returned in request order with a per-operation status.
+    With atomic=true all operations are committed together or not at all.
+    """
+    return await service.execute(batch.operations, atomic=batch.atomic)
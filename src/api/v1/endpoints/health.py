@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from src.core.config import settings
-from src.api.v1.deps import get_db
-from sqlalchemy.orm import Session
+from src.api.v1.deps import get_container
+from src.api.container import Container
+from src.infrastructure.database.postgres_client import pool_metrics
 import os
 
 router = APIRouter()
@@ -34,12 +36,38 @@ async def check_config():
     }
 
 
+@router.get("/live")
+async def liveness(container: Container = Depends(get_container)):
+    """Liveness probe: 503 when the worker's event loop or checker is stuck"""
+    alive, body = container.health.liveness()
+    return JSONResponse(body, status_code=200 if alive else 503)
+
+
+@router.get("/ready")
+async def readiness(container: Container = Depends(get_container)):
+    """
+    Readiness probe with the latest result of every dependency check.
+    Answered from cache; the checks themselves run in the background.
+    """
+    ready, body = container.health.readiness()
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
 @router.get("/db")
-async def check_database(db: Session = Depends(get_db)):
-    """Check database connection"""
-    try:
-        # Execute a simple query
-        result = db.execute("SELECT 1")
-        return {"status": "connected", "result": result.scalar()}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+async def check_database(container: Container = Depends(get_container)):
+    """Check database connection (latest background check)"""
+    result = container.health.results.get("postgres")
+    if result is None:
+        return {"status": "unknown"}
+    if result["status"] != "ok":
+        return {"status": "error", "message": result["error"]}
+    return {"status": "connected", "latency_ms": result["latency_ms"], "checked_at": result["checked_at"]}
+
+
+@router.get("/db/pool")
+async def check_database_pool():
+    """Connection pool telemetry per engine (checkout waits, usage, connection age)"""
+    return {
+        "pool_mode": settings.DATABASE_POOL_MODE,
+        "engines": {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+    }
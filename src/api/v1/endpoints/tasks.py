@@ -1,125 +1,350 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter, Depends, Header, HTTPException, Query, Request, Response,
+    WebSocket, WebSocketDisconnect, status
+)
+from fastapi.responses import StreamingResponse
+import orjson
 
-from src.api.v1.deps import get_db
+from src.api.v1.deps import (
+    get_container, get_task_service, get_read_task_service, get_primary_task_service,
+    get_task_import_service, get_idempotency_store
+)
+from src.api.container import Container
+from src.api.responses import TracedORJSONResponse
+from src.infrastructure.database.postgres_client import get_read_session
 from src.services.task_service import TaskService
+from src.services.task_import import TaskImportService
+from src.services.idempotency import IdempotencyStore
 from src.schemas.task import (
     Task, TaskCreate, TaskUpdate, TextInput,
-    TaskResponse, TaskListResponse
+    TaskResponse, TaskListResponse, TaskSearchResponse, TaskSource,
+    TaskImportResult, TaskStats, TaskChanges
 )
+from src.utils.etag import etag_matches
+
+# Seconds of silence after which the change feed sends a heartbeat
+CHANGE_FEED_HEARTBEAT = 15
 
 router = APIRouter()
 
 
+def _idempotent_response(body, replayed: bool) -> TracedORJSONResponse:
+    return TracedORJSONResponse(body, headers={"Idempotent-Replayed": "true"} if replayed else None)
+
+
 @router.post("/analyze", response_model=TaskResponse)
 async def analyze_text_to_task(
     text_input: TextInput,
-    db: Session = Depends(get_db)
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    service: TaskService = Depends(get_task_service),
+    idempotency: IdempotencyStore = Depends(get_idempotency_store)
 ):
     """
-    Analyze text and create a structured task
+    Analyze text and create a structured task.
+    With an Idempotency-Key header, retries replay the first response
+    instead of calling the LLM and creating the task again.
     """
-    service = TaskService(db)
-    try:
-        return await service.create_task_from_text(text_input)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async def analyze():
+        try:
+            return await service.create_task_from_text(text_input)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    if not idempotency_key:
+        return await analyze()
+    body, replayed = await idempotency.run(
+        "analyze", idempotency_key, text_input.model_dump(mode="json"), analyze
+    )
+    return _idempotent_response(body, replayed)
 
 
 @router.post("/", response_model=Task)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
-    db: Session = Depends(get_db)
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    service: TaskService = Depends(get_task_service),
+    idempotency: IdempotencyStore = Depends(get_idempotency_store)
 ):
     """
-    Create a new task directly
+    Create a new task directly.
+    Supports an Idempotency-Key header (see /analyze).
     """
-    service = TaskService(db)
-    return service.create_task(task_data)
+    if not idempotency_key:
+        return await service.create_task(task_data)
+    body, replayed = await idempotency.run(
+        "create_task",
+        idempotency_key,
+        task_data.model_dump(mode="json"),
+        lambda: service.create_task(task_data)
+    )
+    return _idempotent_response(body, replayed)
 
 
-@router.get("/", response_model=TaskListResponse)
-def list_tasks(
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    batch_size: int = Query(default=500, ge=1, le=5000),
+    analyze: bool = False,
+    analyze_concurrency: int = Query(default=4, ge=1, le=16),
+    import_id: Optional[str] = Query(default=None, max_length=100),
+    service: TaskImportService = Depends(get_task_import_service)
+):
+    """
+    Import tasks from an NDJSON request body, parsed as it streams in.
+    Pass the same import_id when re-sending a file to resume after the last
+    committed line.
+    """
+    return await service.import_ndjson(
+        request.stream(),
+        batch_size=batch_size,
+        analyze=analyze,
+        analyze_concurrency=analyze_concurrency,
+        import_id=import_id
+    )
+
+
+@router.get("/", response_model=TaskListResponse, response_class=TracedORJSONResponse)
+async def list_tasks(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     category: Optional[str] = None,
     priority: Optional[str] = None,
     is_completed: Optional[bool] = None,
     order_by: str = Query(default="created_at", regex="^(created_at|priority)$"),
-    db: Session = Depends(get_db)
+    include_archived: bool = False,
+    if_none_match: Optional[str] = Header(default=None),
+    service: TaskService = Depends(get_read_task_service)
 ):
     """
-    List tasks with pagination and filters
+    List tasks with pagination and filters.
+    Supports conditional GET via ETag / If-None-Match.
     """
-    service = TaskService(db)
-    return service.list_tasks(
+    params = dict(
         page=page,
         page_size=page_size,
         category=category,
         priority=priority,
         is_completed=is_completed,
-        order_by=order_by
+        order_by=order_by,
+        include_archived=include_archived
     )
+    
+    # Unchanged collection: answer from the version alone, without touching rows
+    if if_none_match:
+        etag = await service.list_etag(**params)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    # Rows are serialized straight to JSON; response_model only documents the shape
+    payload, etag = await service.list_tasks_payload(**params)
+    return TracedORJSONResponse(payload, headers={"ETag": etag} if etag else None)
+
+
+@router.get("/search", response_model=TaskSearchResponse, response_class=TracedORJSONResponse)
+def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=100),
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    is_completed: Optional[bool] = None,
+    include_archived: bool = False,
+    service: TaskService = Depends(get_read_task_service)
+):
+    """
+    Full-text search over task title, description and steps (prefix matching)
+    """
+    return TracedORJSONResponse(service.search_tasks_payload(
+        query=q,
+        page=page,
+        page_size=page_size,
+        category=category,
+        priority=priority,
+        is_completed=is_completed,
+        include_archived=include_archived
+    ))
+
+
+@router.get("/stats", response_model=TaskStats)
+def get_task_stats(
+    days: int = Query(default=30, ge=1, le=365),
+    service: TaskService = Depends(get_read_task_service)
+):
+    """
+    Task counts by category, priority and completion, step progress and
+    daily created/completed counts
+    """
+    return service.get_stats(days=days)
 
 
-@router.get("/{task_id}", response_model=Task)
-def get_task(
+@router.get("/changes", response_model=TaskChanges, response_class=TracedORJSONResponse)
+def get_task_changes(
+    since: str = Query(default="0", max_length=100),
+    limit: int = Query(default=500, ge=1, le=1000),
+    service: TaskService = Depends(get_primary_task_service)
+):
+    """
+    Delta sync: tasks changed and ids deleted since the `since` cursor
+    (0 for a full sync). Returns the cursor to pass next time.
+    Served by the primary: a lagging replica could hide changes behind it.
+    """
+    return TracedORJSONResponse(service.get_changes(since=since, limit=limit))
+
+
+@router.get("/export")
+def export_tasks(
+    format: str = Query(default="ndjson", regex="^(ndjson|csv)$"),
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    is_completed: Optional[bool] = None,
+    include_archived: bool = False,
+    container: Container = Depends(get_container)
+):
+    """
+    Stream all matching tasks as NDJSON (steps nested) or CSV (one row per step)
+    """
+    def stream():
+        # The session is owned by the stream, not a request dependency, so it
+        # stays open exactly as long as the response body is being produced.
+        db = get_read_session()
+        try:
+            yield from container.task_service(db).export_tasks(
+                format=format,
+                category=category,
+                priority=priority,
+                is_completed=is_completed,
+                include_archived=include_archived
+            )
+        finally:
+            db.close()
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=tasks.{format}"}
+    )
+
+
+@router.get("/events")
+async def task_events_sse(container: Container = Depends(get_container)):
+    """
+    Server-Sent Events stream of task changes (created, updated,
+    step_toggled, deleted, bulk, resync). Events carry the task id only;
+    clients re-fetch what they display. On "resync" or "bulk", re-fetch lists.
+    """
+    feed = container.task_events
+    
+    async def stream():
+        async with feed.subscribe() as queue:
+            yield b"retry: 3000\n\n"
+            while True:
+                event = await feed.next_event(queue, CHANGE_FEED_HEARTBEAT)
+                if event is None:
+                    yield b": heartbeat\n\n"
+                else:
+                    yield b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/events/ws")
+async def task_events_ws(websocket: WebSocket, container: Container = Depends(get_container)):
+    """
+    WebSocket variant of the task change feed; heartbeats are sent as
+    {"type": "heartbeat"} messages.
+    """
+    feed = container.task_events
+    await websocket.accept()
+    try:
+        async with feed.subscribe() as queue:
+            while True:
+                event = await feed.next_event(queue, CHANGE_FEED_HEARTBEAT)
+                await websocket.send_text(orjson.dumps(event or {"type": "heartbeat"}).decode())
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/{task_id}", response_model=Task, response_class=TracedORJSONResponse)
+async def get_task(
     task_id: UUID,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(default=None),
+    service: TaskService = Depends(get_read_task_service)
 ):
     """
-    Get a specific task
+    Get a specific task.
+    Supports conditional GET via ETag / If-None-Match.
     """
-    service = TaskService(db)
-    task = service.get_task(task_id)
-    if not task:
+    
+    if if_none_match:
+        etag = await service.task_etag(task_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    payload, etag = await service.get_task_payload(task_id)
+    if not payload:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return TracedORJSONResponse(payload, headers={"ETag": etag} if etag else None)
+
+
+@router.get("/{task_id}/source", response_model=TaskSource)
+async def get_task_source(
+    task_id: UUID,
+    service: TaskService = Depends(get_read_task_service)
+):
+    """
+    Get the raw text a task was created from
+    """
+    source = await service.get_task_source(task_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return source
 
 
 @router.patch("/{task_id}", response_model=Task)
-def update_task(
+async def update_task(
     task_id: UUID,
     update_data: TaskUpdate,
-    db: Session = Depends(get_db)
+    service: TaskService = Depends(get_task_service)
 ):
     """
     Update a task
     """
-    service = TaskService(db)
-    task = service.update_task(task_id, update_data)
+    task = await service.update_task(task_id, update_data)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
 @router.post("/steps/{step_id}/toggle-completion")
-def toggle_step_completion(
+async def toggle_step_completion(
     step_id: UUID,
-    db: Session = Depends(get_db)
+    service: TaskService = Depends(get_task_service)
 ):
     """
     Toggle step completion status
     """
-    service = TaskService(db)
-    success = service.toggle_step_completion(step_id)
+    success = await service.toggle_step_completion(step_id)
     if not success:
         raise HTTPException(status_code=404, detail="Step not found")
     return {"success": True}
 
 
 @router.delete("/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: UUID,
-    db: Session = Depends(get_db)
+    service: TaskService = Depends(get_task_service)
 ):
     """
     Delete a task
     """
-    service = TaskService(db)
-    success = service.delete_task(task_id)
+    success = await service.delete_task(task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return {"success": True}
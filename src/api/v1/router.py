@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from src.api.v1.endpoints import health, tasks
+from src.api.v1.endpoints import admin, batch, health, tasks
 
 api_router = APIRouter()
 
 api_router.include_router(health.router, prefix="/health", tags=["health"])
-api_router.include_router(tasks.router, prefix="/AI Tasks", tags=["tasks"])
\ No newline at end of file
+api_router.include_router(tasks.router, prefix="/AI Tasks", tags=["tasks"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Log formatters referenced from config/logging_config.yaml.
+
+Kept apart from src.core.logging, which applies that config while it is
+still being imported and so cannot be resolved by dictConfig itself.
+"""
+import logging
+
+
+class SuppressedCountFormatter(logging.Formatter):
+    """Appends the number of similar records RateLimitFilter held back before this one"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" ({suppressed} similar suppressed)"
+        return message
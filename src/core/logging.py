@@ -1,18 +1,187 @@
+"""
+Logging setup.
+
+Handlers from config/logging_config.yaml do not run on the thread that logs.
+Each logger gets a QueueHandler that puts the record, unformatted, on a
+bounded queue and returns; a QueueListener thread formats the record and
+writes it to the logger's configured handlers. Log calls on the event loop
+therefore never wait on file or console I/O. When the queue is full the
+record is dropped and counted rather than blocking the caller.
+
+A RateLimitFilter in front of the queue lets the first few repeats of a
+message through per period and then samples the rest, so an error repeated
+on every request cannot flood the queue.
+"""
+from collections import Counter
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+import atexit
 import logging
 import logging.config
-import yaml
+import logging.handlers
+import queue
+import threading
+import time
 from pathlib import Path
+from config.settings.base import load_yaml_config
 from src.core.config import settings
 
 
+class LogPipelineStats:
+    """Records dropped (queue full) and suppressed (rate limited) per level"""
+    
+    def __init__(self):
+        self.dropped: Counter = Counter()
+        self.suppressed: Counter = Counter()
+        self.queues: List[queue.Queue] = []
+    
+    def queued(self) -> int:
+        return sum(q.qsize() for q in self.queues)
+
+
+pipeline_stats = LogPipelineStats()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per logger and message template: let `burst` records through per
+    `period` seconds, then only one in every `sample_every`. The next record
+    let through carries the number suppressed before it as `suppressed`.
+    
+    Templates are the unformatted message ("Redis get error: %s"), so repeats
+    with different arguments count as the same message. The exception type
+    (from exc_info, or an exception passed as the first argument) is part of
+    the key, so a generic template logging different errors does not share
+    one budget across them.
+    """
+    
+    def __init__(self, burst: int = 10, period: float = 60, sample_every: int = 100, max_keys: int = 10000):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.sample_every = sample_every
+        self.max_keys = max_keys
+        # key -> [window start, records seen in window, suppressed since last emitted]
+        self._windows: Dict[Tuple[str, int, str, Optional[str]], list] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _exception_type(record: logging.LogRecord) -> Optional[str]:
+        if record.exc_info and record.exc_info[0] is not None:
+            return record.exc_info[0].__qualname__
+        args = record.args
+        if isinstance(args, tuple) and args and isinstance(args[0], BaseException):
+            return type(args[0]).__qualname__
+        return None
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg), self._exception_type(record))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                if window is None and len(self._windows) >= self.max_keys:
+                    self._windows.clear()
+                suppressed = window[2] if window else 0
+                window = self._windows[key] = [now, 0, suppressed]
+            window[1] += 1
+            seen = window[1]
+            if seen > self.burst and (seen - self.burst) % self.sample_every:
+                window[2] += 1
+                pipeline_stats.suppressed[record.levelname] += 1
+                return False
+            if window[2]:
+                record.suppressed = window[2]
+                window[2] = 0
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on a bounded queue without formatting them (that happens on
+    the listener thread) and drops them when the queue is full.
+    The record is queued with the handlers it is destined for, so loggers
+    sharing one queue keep their own handler sets.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, targets: List[logging.Handler]):
+        super().__init__(log_queue)
+        self.targets = targets
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait((record, self.targets))
+        except queue.Full:
+            pipeline_stats.dropped[record.levelname] += 1
+        except Exception:
+            self.handleError(record)
+
+
+class RoutingQueueListener(logging.handlers.QueueListener):
+    """Hands each queued record to the handlers it was queued with"""
+    
+    def handle(self, item) -> None:
+        record, targets = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def enqueue_sentinel(self) -> None:
+        # Block rather than drop: the listener must see the sentinel to stop
+        self.queue.put(self._sentinel)
+
+
+_listener: Optional[RoutingQueueListener] = None
+
+
+def _install_queue(logger_names: List[Optional[str]], options: Dict[str, Any]) -> None:
+    """Move the handlers of the configured loggers behind one queue"""
+    global _listener
+    
+    log_queue: queue.Queue = queue.Queue(maxsize=options.get("maxsize", 10000))
+    rate_limit = RateLimitFilter(**options.get("rate_limit", {}))
+    queue_handlers: Dict[tuple, DroppingQueueHandler] = {}
+    
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            continue
+        targets = tuple(logger.handlers)
+        handler = queue_handlers.get(targets)
+        if handler is None:
+            handler = DroppingQueueHandler(log_queue, list(targets))
+            handler.addFilter(rate_limit)
+            queue_handlers[targets] = handler
+        logger.handlers = [handler]
+    
+    pipeline_stats.queues.append(log_queue)
+    _listener = RoutingQueueListener(log_queue)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging():
     """Setup logging configuration"""
-    config_path = Path(__file__).parent.parent.parent / "config" / "logging_config.yaml"
+    config = deepcopy(load_yaml_config("logging_config.yaml"))
     
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            logging.config.dictConfig(config)
+    if config:
+        queue_options = config.pop("queue", None)
+        if "src" in config.get("loggers", {}):
+            config["loggers"]["src"]["level"] = settings.LOG_LEVEL
+        for handler in config.get("handlers", {}).values():
+            if "filename" in handler:
+                Path(handler["filename"]).parent.mkdir(parents=True, exist_ok=True)
+        logging.config.dictConfig(config)
+        if queue_options is not None:
+            _install_queue([None, *config.get("loggers", {})], queue_options)
     else:
         # Fallback to basic configuration
         logging.basicConfig(
@@ -27,4 +196,4 @@ def get_logger(name: str) -> logging.Logger:
 
 
 # Initialize logging
-setup_logging()
\ No newline at end of file
+setup_logging()
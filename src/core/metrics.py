@@ -0,0 +1,189 @@
+"""
+Prometheus metrics.
+
+Every label value comes from a small fixed set (route templates, status
+codes, provider/model names, cache and command names), so the number of
+series stays bounded no matter what clients send. Set PROMETHEUS_MULTIPROC_DIR
+when running several worker processes so /metrics aggregates all of them.
+"""
+import asyncio
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.logging import get_logger, pipeline_stats
+from src.core.tracing import RequestTrace, current_trace, record_span, slow_requests
+
+logger = get_logger(__name__)
+
+HTTP_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+# Latency buckets (seconds) tuned for API calls; LLM calls get longer ones
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code",
+    ["route", "method", "status"],
+    buckets=FAST_BUCKETS
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["engine"],
+    buckets=FAST_BUCKETS
+)
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds",
+    "LLM API call latency",
+    ["provider", "model", "outcome"],
+    buckets=SLOW_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens used by LLM calls",
+    ["provider", "model", "kind"]
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=FAST_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a periodic event loop callback was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+
+class LogPipelineCollector:
+    """Log records dropped and suppressed by the logging pipeline (this process)"""
+    
+    def collect(self):
+        dropped = CounterMetricFamily(
+            "log_records_dropped", "Log records dropped because the log queue was full", labels=["level"]
+        )
+        for level, count in pipeline_stats.dropped.items():
+            dropped.add_metric([level], count)
+        suppressed = CounterMetricFamily(
+            "log_records_suppressed", "Repeated log records suppressed by rate limiting", labels=["level"]
+        )
+        for level, count in pipeline_stats.suppressed.items():
+            suppressed.add_metric([level], count)
+        yield dropped
+        yield suppressed
+        yield GaugeMetricFamily("log_queue_size", "Log records waiting to be written", value=pipeline_stats.queued())
+
+
+log_pipeline_collector = LogPipelineCollector()
+REGISTRY.register(log_pipeline_collector)
+
+
+def record_db_query(engine_name: str, seconds: float) -> None:
+    DB_QUERY_DURATION.labels(engine_name).observe(seconds)
+    record_span("db", seconds)
+
+
+def record_llm_call(provider: str, model: str, outcome: str, seconds: float) -> None:
+    LLM_CALL_DURATION.labels(provider, model, outcome).observe(seconds)
+    record_span("llm", seconds)
+
+
+def record_redis_command(histogram, seconds: float) -> None:
+    histogram.observe(seconds)
+    record_span("redis", seconds)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Time every statement executed through an engine"""
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_db_query(name, time.perf_counter() - conn.info["query_start"].pop())
+
+
+class MetricsMiddleware:
+    """
+    Records request latency and SQL statement count per route (plain ASGI),
+    and hands slow requests with their span breakdown to the slow request log
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            current_trace.reset(token)
+            # The router stores the matched route in the scope; using its path
+            # template keeps ids and unknown URLs out of the labels
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            HTTP_REQUEST_DURATION.labels(route_label, method, str(status_code)).observe(duration)
+            HTTP_REQUEST_DB_QUERIES.labels(route_label).observe(trace.counts["db"])
+            slow_requests.observe(trace, method, route_label, scope["path"], status_code, duration)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Measure how late a periodic sleep wakes up; runs until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+def render_metrics() -> tuple:
+    """Metrics in the Prometheus text format, and their content type"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Not aggregated across processes: reports the worker serving /metrics
+        registry.register(log_pipeline_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,65 @@
+"""
+On-demand sampling profiler.
+
+Samples the Python stack of every thread of the process at a fixed interval
+and aggregates them in the collapsed-stack format understood by flamegraph.pl
+and speedscope ("root;caller;callee count" per line). Nothing runs until a
+profile is requested, and sampling only reads sys._current_frames(), so it
+can be used on a live worker.
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Dict
+import sys
+import threading
+import time
+
+from src.core.exceptions import AppException
+
+
+class SamplingProfiler:
+    """Collects one profile at a time"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels: Dict[object, str] = {}
+    
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # co_qualname is new in Python 3.11; the image runs 3.10
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+    
+    def profile(self, seconds: float, interval: float) -> str:
+        """Sample for `seconds` (blocking; run it in a worker thread)"""
+        if not self._lock.acquire(blocking=False):
+            raise AppException(
+                message="A profile is already being collected",
+                error_code="PROFILER_BUSY",
+                status_code=409
+            )
+        try:
+            own_thread = threading.get_ident()
+            stacks: Counter = Counter()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_thread:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(self._label(frame.f_code))
+                        frame = frame.f_back
+                    stack.append(names.get(ident, f"thread-{ident}").replace(";", ","))
+                    stacks[";".join(reversed(stack))] += 1
+                time.sleep(interval)
+            return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        finally:
+            self._lock.release()
+
+
+profiler = SamplingProfiler()
@@ -1,10 +1,77 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
+import asyncio
+import threading
+import time
 from src.core.config import settings
+from src.core.metrics import record_cache_lookup
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose (with its crypto backend) and passlib/bcrypt are imported on first use
+# rather than at startup; most workers verify tokens from the cache and few
+# ever hash a password.
+
+
+@lru_cache(maxsize=None)
+def get_password_context():
+    """Shared passlib context, created on first use"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt takes ~100 ms of CPU per call. The async helpers below run it on this
+# dedicated, size-capped pool so a burst of logins queues here instead of
+# blocking the event loop or taking over the shared threadpool.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified token claims.
+    
+    Entries expire at the token's own `exp`, and at the latest `ttl` seconds
+    after verification so that tokens without `exp` (or a rotated secret) are
+    re-checked eventually. Only successfully verified tokens are cached.
+    """
+    
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return dict(claims)
+    
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        with self._lock:
+            self._entries[token] = (dict(claims), expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -16,24 +83,40 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def verify_token(token: str) -> Dict[str, Any]:
-    """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    """Verify JWT token (verified claims are cached until the token expires)"""
+    payload = token_cache.get(token)
+    record_cache_lookup("token", payload is not None)
+    if payload is not None:
         return payload
-    except JWTError:
-        raise
+    from jose import jwt
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    token_cache.set(token, payload)
+    return payload
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash password"""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_password_context().hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Per-request span accounting and slow-request capture.
+
+Instrumented code (SQL statements, Redis commands, LLM calls, response
+rendering) reports its time with record_span(); MetricsMiddleware opens a
+RequestTrace per request. Requests slower than SLOW_REQUEST_THRESHOLD_MS are
+logged with their breakdown and kept in a ring buffer for /admin.
+"""
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import threading
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SPAN_KINDS = ("db", "redis", "llm", "serialization")
+
+
+class RequestTrace:
+    """Time and count per span kind for one request"""
+    
+    __slots__ = ("counts", "seconds", "_lock")
+    
+    def __init__(self):
+        self.counts = dict.fromkeys(SPAN_KINDS, 0)
+        self.seconds = dict.fromkeys(SPAN_KINDS, 0.0)
+        # Spans may be recorded from threadpool workers concurrently
+        self._lock = threading.Lock()
+    
+    def add(self, kind: str, seconds: float) -> None:
+        with self._lock:
+            self.counts[kind] += 1
+            self.seconds[kind] += seconds
+    
+    def breakdown(self, total: float) -> Dict[str, Any]:
+        spans = {
+            kind: {"count": self.counts[kind], "ms": round(self.seconds[kind] * 1000, 2)}
+            for kind in SPAN_KINDS if self.counts[kind]
+        }
+        # Spans can overlap (concurrent queries), so "other" is a lower bound
+        other = max(0.0, total - sum(self.seconds.values()))
+        spans["other"] = {"ms": round(other * 1000, 2)}
+        return spans
+
+
+# Holds the trace of the request being handled. Threadpool workers get a copy
+# of the context, which still points at the same RequestTrace.
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+def record_span(kind: str, seconds: float) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(kind, seconds)
+
+
+class SlowRequestLog:
+    """Ring buffer of the most recent slow requests"""
+    
+    def __init__(self, threshold_ms: int, size: int):
+        self.threshold = threshold_ms / 1000
+        self._entries: deque = deque(maxlen=size)
+    
+    def observe(
+        self,
+        trace: RequestTrace,
+        method: str,
+        route: str,
+        path: str,
+        status_code: int,
+        duration: float
+    ) -> None:
+        if duration < self.threshold:
+            return
+        entry = {
+            "at": datetime.utcnow().isoformat(),
+            "method": method,
+            "route": route,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "spans": trace.breakdown(duration),
+        }
+        self._entries.append(entry)
+        logger.warning("Slow request %s %s took %sms: %s", method, path, entry['duration_ms'], entry['spans'])
+    
+    def entries(self) -> List[Dict[str, Any]]:
+        """Captured slow requests, newest first"""
+        return list(reversed(self._entries))
+
+
+slow_requests = SlowRequestLog(settings.SLOW_REQUEST_THRESHOLD_MS, settings.SLOW_REQUEST_BUFFER_SIZE)
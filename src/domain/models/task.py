@@ -0,0 +1,230 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import (
+    Column, String, Text, Boolean, Integer, BigInteger, Date, DateTime, ForeignKey,
+    Index, Computed, LargeBinary, Sequence, func, inspect, text
+)
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship
+
+from src.infrastructure.database.postgres_client import Base
+from src.utils.compression import decompress_text
+
+# Text search configuration used by the generated search column and by queries.
+# Must be passed as a literal regconfig so the generated expression is immutable.
+SEARCH_CONFIG = "english"
+
+# Delta sync. Every insert/update of a task and every tombstone records the
+# id of its transaction (change_txid) and takes the next value of a
+# database-wide counter (change_seq), which orders changes made by one
+# transaction. Sync cursors are transaction ids: sequence values are taken
+# before commit, so a lower change_seq can still appear after a higher one,
+# while a transaction id below the oldest running transaction is final.
+task_change_seq = Sequence("task_change_seq")
+CURRENT_TXID = "txid_current()"
+
+
+class TaskModel(Base):
+    """
+    Task ORM model.
+    
+    The table is partitioned by LIST (is_archived): the hot partition is
+    range-partitioned by month on created_at, archived tasks live in the cold
+    partition. Partitions are managed by src.workers.partition_maintenance.
+    Postgres requires partition keys in the primary key, so the key is
+    (id, created_at, is_archived); ORM updates and deletes match all three
+    and only touch the row's partition. Ids are UUIDv7 made from created_at,
+    so lookups by id can be pruned as well (see TaskRepository._by_id).
+    """
+    __tablename__ = "tasks"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    priority = Column(String(20), nullable=False, default="medium", index=True)
+    category = Column(String(50), nullable=False, default="general", index=True)
+    source_hash = Column(String(64), ForeignKey("source_texts.hash"), nullable=True, index=True)
+    is_completed = Column(Boolean, nullable=False, default=False, index=True)
+    created_at = Column(
+        DateTime, primary_key=True, nullable=False, default=datetime.utcnow, index=True
+    )
+    completed_at = Column(DateTime, nullable=True)
+    is_archived = Column(Boolean, primary_key=True, nullable=False, default=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = Column(
+        BigInteger, task_change_seq, onupdate=task_change_seq.next_value(), nullable=False
+    )
+    change_txid = Column(
+        BigInteger, nullable=False, server_default=text(CURRENT_TXID), onupdate=func.txid_current()
+    )
+    
+    # Denormalized step descriptions; generated columns cannot read other tables,
+    # so the repository keeps this in sync whenever steps are written.
+    steps_text = Column(Text, nullable=False, default="")
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(steps_text, '')), 'C')",
+            persisted=True
+        )
+    )
+    
+    # No database FK between steps and tasks: a FK into a partitioned table
+    # would have to carry every partition key. Step cleanup is done by the ORM.
+    # Steps share the task's created_at; joining on it as well lets Postgres
+    # match each task to the one step partition holding its steps.
+    steps = relationship(
+        "TaskStepModel",
+        primaryjoin=(
+            "and_(TaskModel.id == foreign(TaskStepModel.task_id), "
+            "TaskModel.created_at == foreign(TaskStepModel.created_at))"
+        ),
+        back_populates="task",
+        cascade="all, delete-orphan",
+        order_by="TaskStepModel.order_index"
+    )
+    source = relationship("SourceTextModel")
+    
+    __table_args__ = (
+        Index("ix_tasks_search_vector", search_vector, postgresql_using="gin"),
+        Index("ix_tasks_change", change_txid, change_seq),
+        # Candidates for archival (see src.workers.partition_maintenance)
+        Index(
+            "ix_tasks_archivable", completed_at,
+            postgresql_where=text("is_completed AND NOT is_archived")
+        ),
+        {"postgresql_partition_by": "LIST (is_archived)"},
+    )
+    
+    @property
+    def source_text(self) -> Optional[str]:
+        """
+        Raw source text, only if the source blob was explicitly loaded.
+        Never triggers a lazy load, so serializing lists stays one query.
+        """
+        if "source" in inspect(self).unloaded or self.source is None:
+            return None
+        return self.source.text
+
+
+class SourceTextModel(Base):
+    """Content-addressed, compressed raw source text shared by tasks"""
+    __tablename__ = "source_texts"
+    
+    hash = Column(String(64), primary_key=True)  # sha256 of the UTF-8 text
+    codec = Column(String(10), nullable=False)
+    size = Column(Integer, nullable=False)  # uncompressed size in bytes
+    payload = Column(LargeBinary, nullable=False)
+    # Refreshed whenever a new task reuses the text, see the orphan sweep in
+    # src.workers.partition_maintenance
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    @property
+    def text(self) -> str:
+        return decompress_text(self.codec, self.payload)
+
+
+class TaskStepModel(Base):
+    """
+    Task step ORM model.
+    Range-partitioned by month on the owning task's created_at, which is also
+    the time in its UUIDv7 id; the key is (id, created_at).
+    """
+    __tablename__ = "task_steps"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    description = Column(Text, nullable=False)
+    order_index = Column(Integer, nullable=False, default=0)
+    is_completed = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
+    
+    task = relationship(
+        "TaskModel",
+        primaryjoin=(
+            "and_(foreign(TaskStepModel.task_id) == TaskModel.id, "
+            "foreign(TaskStepModel.created_at) == TaskModel.created_at)"
+        ),
+        back_populates="steps"
+    )
+    
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+
+
+
+class TaskStatsModel(Base):
+    """
+    Incrementally maintained rollup of task and step counts per
+    (category, priority, is_completed), so reading stats never scans tasks.
+    Task writes append to task_stats_deltas in their own transaction; the
+    deltas are folded in here periodically (see TaskStatsRepository).
+    """
+    __tablename__ = "task_stats"
+    
+    category = Column(String(50), primary_key=True)
+    priority = Column(String(20), primary_key=True)
+    is_completed = Column(Boolean, primary_key=True)
+    task_count = Column(BigInteger, nullable=False, default=0)
+    step_count = Column(BigInteger, nullable=False, default=0)
+    steps_completed = Column(BigInteger, nullable=False, default=0)
+
+
+class TaskDailyStatsModel(Base):
+    """Per-day counts of created and completed tasks"""
+    __tablename__ = "task_stats_daily"
+    
+    day = Column(Date, primary_key=True)
+    created_count = Column(BigInteger, nullable=False, default=0)
+    completed_count = Column(BigInteger, nullable=False, default=0)
+
+
+class TaskStatsDeltaModel(Base):
+    """Change to a task_stats row not folded in yet (insert-only)"""
+    __tablename__ = "task_stats_deltas"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    category = Column(String(50), nullable=False)
+    priority = Column(String(20), nullable=False)
+    is_completed = Column(Boolean, nullable=False)
+    task_count = Column(BigInteger, nullable=False, default=0)
+    step_count = Column(BigInteger, nullable=False, default=0)
+    steps_completed = Column(BigInteger, nullable=False, default=0)
+
+
+class TaskDailyStatsDeltaModel(Base):
+    """Change to a task_stats_daily row not folded in yet (insert-only)"""
+    __tablename__ = "task_stats_daily_deltas"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    created_count = Column(BigInteger, nullable=False, default=0)
+    completed_count = Column(BigInteger, nullable=False, default=0)
+
+
+class TaskTombstoneModel(Base):
+    """Ids of deleted tasks, reported to delta sync clients until compacted"""
+    __tablename__ = "task_tombstones"
+    
+    task_id = Column(UUID(as_uuid=True), primary_key=True)
+    change_seq = Column(BigInteger, task_change_seq, nullable=False)
+    change_txid = Column(BigInteger, nullable=False, server_default=text(CURRENT_TXID))
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        Index("ix_task_tombstones_change", change_txid, change_seq),
+    )
+
+
+class TaskSyncHorizonModel(Base):
+    """
+    Single row holding the change_txid through which tombstones have been
+    compacted. A client whose cursor is older may have missed deletes and
+    has to resync from scratch.
+    """
+    __tablename__ = "task_sync_horizon"
+    
+    id = Column(Integer, primary_key=True, default=1)
+    compacted_through = Column(BigInteger, nullable=False, default=0)
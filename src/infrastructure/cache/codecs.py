@@ -0,0 +1,80 @@
+"""
+Value codecs for RedisCache.
+
+Every stored value starts with a one-byte tag naming its format, so the
+configured codec can change without flushing Redis: any codec reads every
+format. Untagged values are JSON text, which is what was stored before codecs
+were pluggable (JSON text never starts with one of the tag bytes).
+"""
+from typing import Any
+import json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from src.utils.compression import compress_bytes, decompress_bytes
+
+MSGPACK = b"\x01"
+# Compressed msgpack, by compression codec
+COMPRESSED_TAGS = {"zlib": b"\x02", "zstd": b"\x03"}
+COMPRESSION_BY_TAG = {tag: codec for codec, tag in COMPRESSED_TAGS.items()}
+
+# Cache values are written on the request path: favour speed over ratio
+CACHE_ZSTD_LEVEL = 3
+
+
+class Codec:
+    """Encodes values to bytes; decoding understands every format"""
+    
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+    
+    def decode(self, data: bytes) -> Any:
+        tag = data[:1]
+        if tag == MSGPACK:
+            return _unpack(data[1:])
+        if tag in COMPRESSION_BY_TAG:
+            return _unpack(decompress_bytes(COMPRESSION_BY_TAG[tag], data[1:]))
+        return json.loads(data)
+
+
+class JsonCodec(Codec):
+    """Untagged JSON text"""
+    
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+
+class MsgpackCodec(Codec):
+    """msgpack, compressed (zstd, or zlib without zstandard) from `compress_min_bytes`"""
+    
+    def __init__(self, compress_min_bytes: int = 1024):
+        if msgpack is None:
+            raise RuntimeError("msgpack is required for MsgpackCodec")
+        self.compress_min_bytes = compress_min_bytes
+    
+    def encode(self, value: Any) -> bytes:
+        packed = msgpack.packb(value, use_bin_type=True)
+        if len(packed) >= self.compress_min_bytes:
+            compression, payload = compress_bytes(packed, zstd_level=CACHE_ZSTD_LEVEL)
+            # Incompressible values are not worth the decompression cost
+            if len(payload) < len(packed):
+                return COMPRESSED_TAGS[compression] + payload
+        return MSGPACK + packed
+
+
+def _unpack(data: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("msgpack is required to read msgpack-encoded values")
+    return msgpack.unpackb(data, raw=False)
+
+
+def get_codec(name: str, compress_min_bytes: int = 1024) -> Codec:
+    """Codec by name; falls back to JSON when msgpack is not installed"""
+    if name == "msgpack" and msgpack is not None:
+        return MsgpackCodec(compress_min_bytes)
+    if name not in ("json", "msgpack"):
+        raise ValueError(f"Unknown cache codec: {name}")
+    return JsonCodec()
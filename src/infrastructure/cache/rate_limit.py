@@ -0,0 +1,205 @@
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Sequence, Tuple
+import math
+import time
+
+from src.infrastructure.cache.redis import RedisCache
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# GCRA over every limit that applies to a request, in one atomic step.
+# KEYS: one bucket per limit. ARGV: per key, emission interval (ms per
+# request), burst (ms, = period), the number of tokens wanted (lease) and
+# the number of unused tokens from this process's previous lease to give
+# back first. Each bucket stores its theoretical arrival time (TAT) in ms;
+# a refund moves it back by the refunded tokens. A request is counted
+# against all limits or none: either {1, granted tokens per key...} or
+# {0, retry after ms, index of the exhausted key}.
+GCRA_SCRIPT = """
+redis.replicate_commands()
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
+local tats = {}
+local grants = {}
+local denied
+for i, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[i * 4 - 3])
+    local burst = tonumber(ARGV[i * 4 - 2])
+    local wanted = tonumber(ARGV[i * 4 - 1])
+    local refund = tonumber(ARGV[i * 4])
+    local tat = tonumber(redis.call('GET', key)) or now
+    tat = math.max(tat - refund * emission, now)
+    tats[i] = tat
+    grants[i] = math.min(wanted, math.floor((now + burst - tat) / emission))
+    if grants[i] < 1 and not denied then
+        denied = {0, math.ceil(tat + emission - burst - now), i}
+    end
+end
+-- Refunds are kept even when the request is denied
+for i, key in ipairs(KEYS) do
+    local grant = denied and 0 or grants[i]
+    local new_tat = math.ceil(tats[i] + grant * tonumber(ARGV[i * 4 - 3]))
+    if new_tat > now then
+        redis.call('SET', key, new_tat, 'PX', new_tat - math.floor(now))
+    else
+        redis.call('DEL', key)
+    end
+end
+if denied then
+    return denied
+end
+return {1, unpack(grants)}
+"""
+
+
+class RateLimit(NamedTuple):
+    requests: int
+    period: float  # seconds
+    
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse "<requests>/<seconds>", e.g. "10/60" """
+        requests, period = spec.split("/")
+        return cls(int(requests), float(period))
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    retry_after: float = 0.0  # seconds
+
+
+class _Lease:
+    """Tokens of one bucket already charged in Redis, usable by this process"""
+    
+    __slots__ = ("tokens", "granted", "granted_at", "expires_at", "blocked_until")
+    
+    def __init__(
+        self,
+        tokens: int = 0,
+        granted: int = 0,
+        granted_at: float = 0.0,
+        expires_at: float = 0.0,
+        blocked_until: float = 0.0
+    ):
+        self.tokens = tokens
+        self.granted = granted
+        self.granted_at = granted_at
+        self.expires_at = expires_at
+        self.blocked_until = blocked_until
+
+
+class RateLimiter:
+    """
+    Distributed GCRA rate limiter with an in-process tier.
+    
+    Every limit is a GCRA bucket in Redis, updated by one Lua script call per
+    request, so concurrent requests cannot slip past the limit and all limits
+    of a request are checked in a single round trip.
+    
+    Rather than one token per call, the script leases a batch of tokens to
+    this process, which then serves the following requests for that bucket
+    locally until the lease is used up or expires. Leased tokens are already
+    charged in Redis, so the limit holds across processes, but tokens
+    sitting in a lease are unavailable to other processes. Leases are
+    therefore sized from the rate this process saw on the bucket during its
+    previous lease (what it will use in lease_seconds), capped at
+    lease_fraction of the limit, and tokens left in an expired lease are
+    refunded with the next call for that bucket. Tokens of a lease that is
+    never renewed stay charged until the bucket drains, at most one lease's
+    worth per process.
+    
+    Denials are remembered until their retry-after passes, so a client over
+    its limit does not reach Redis either. If Redis is unavailable requests
+    are allowed.
+    """
+    
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        lease_fraction: float = 0.1,
+        lease_seconds: float = 1.0,
+        max_local_keys: int = 10000
+    ):
+        self.cache = cache or RedisCache()
+        self.lease_fraction = lease_fraction
+        self.lease_seconds = lease_seconds
+        self.max_local_keys = max_local_keys
+        self._local: "OrderedDict[str, _Lease]" = OrderedDict()
+    
+    def _lease_size(self, limit: RateLimit, previous: Optional[_Lease], now: float) -> int:
+        """Tokens this process is expected to use in lease_seconds, within the cap"""
+        cap = max(1, int(limit.requests * self.lease_fraction))
+        if previous is None or not previous.granted:
+            return 1
+        used = previous.granted - previous.tokens
+        rate = used / max(now - previous.granted_at, 0.001)
+        return max(1, min(cap, math.ceil(rate * self.lease_seconds)))
+    
+    def _remember(self, key: str, lease: _Lease) -> None:
+        self._local[key] = lease
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_keys:
+            self._local.popitem(last=False)
+    
+    async def hit(self, limits: Sequence[Tuple[str, RateLimit]]) -> RateLimitResult:
+        """Count one request against each (key, limit) pair"""
+        now = time.monotonic()
+        reserved = []
+        pending = []
+        for key, limit in limits:
+            lease = self._local.get(key)
+            if lease is not None and lease.blocked_until > now:
+                self._refund(reserved)
+                return RateLimitResult(False, lease.blocked_until - now)
+            if lease is not None and lease.tokens > 0 and lease.expires_at > now:
+                # Reserve before awaiting Redis so concurrent requests in this
+                # process cannot spend the same token
+                lease.tokens -= 1
+                reserved.append(lease)
+            else:
+                pending.append((key, limit))
+        
+        if not pending:
+            return RateLimitResult(True)
+        
+        args = []
+        for key, limit in pending:
+            previous = self._local.get(key)
+            emission = limit.period * 1000 / limit.requests
+            args.extend([emission, limit.period * 1000, self._lease_size(limit, previous, now)])
+            refund = 0
+            if previous is not None and previous.tokens > 0:
+                # Taken before awaiting Redis so no other request refunds them again
+                refund, previous.tokens = previous.tokens, 0
+            args.append(refund)
+        reply = await self.cache.run_script(GCRA_SCRIPT, [key for key, _ in pending], args)
+        if reply is None:
+            return RateLimitResult(True)
+        
+        now = time.monotonic()
+        if not int(reply[0]):
+            self._refund(reserved)
+            retry_after = int(reply[1]) / 1000
+            denied_key = pending[int(reply[2]) - 1][0]
+            self._remember(denied_key, _Lease(blocked_until=now + retry_after))
+            return RateLimitResult(False, retry_after)
+        
+        for (key, _), granted in zip(pending, reply[1:]):
+            # One of the granted tokens pays for this request. Tokens of a
+            # lease a concurrent request got meanwhile are still charged, so
+            # they are carried over rather than dropped.
+            current = self._local.get(key)
+            carried = current.tokens if current is not None else 0
+            self._remember(key, _Lease(
+                tokens=int(granted) - 1 + carried,
+                granted=int(granted) + carried,
+                granted_at=now,
+                expires_at=now + self.lease_seconds
+            ))
+        return RateLimitResult(True)
+    
+    @staticmethod
+    def _refund(leases) -> None:
+        for lease in leases:
+            lease.tokens += 1
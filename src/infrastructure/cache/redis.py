@@ -1,72 +1,269 @@
-from typing import Optional, Any
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from functools import wraps
 import redis.asyncio as redis
 import json
+import time
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.core.metrics import REDIS_COMMAND_DURATION, record_redis_command
+from src.infrastructure.cache.codecs import Codec, get_codec
 
 logger = get_logger(__name__)
 
 
+def timed(method):
+    """Record the latency of a cache operation under its method name"""
+    histogram = REDIS_COMMAND_DURATION.labels(method.__name__)
+    
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            record_redis_command(histogram, time.perf_counter() - start)
+    return wrapper
+
+
+_connection_pool: Optional[redis.ConnectionPool] = None
+
+
+def get_connection_pool() -> redis.ConnectionPool:
+    """
+    Process-wide connection pool shared by every RedisCache.
+    Connections are opened on demand and reused; values are bytes (see codecs).
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = redis.ConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+    return _connection_pool
+
+
+class CachePipeline:
+    """
+    Commands buffered and sent to Redis in one round trip.
+    Results come back from execute() decoded, in command order. Unlike the
+    single-command methods of RedisCache, execute() raises on errors.
+    """
+    
+    def __init__(self, cache: "RedisCache", transaction: bool):
+        self.cache = cache
+        self.transaction = transaction
+        self._pipeline = cache.redis_client.pipeline(transaction=transaction)
+        self._decoders: List[Callable[[Any], Any]] = []
+    
+    def get(self, key: str) -> "CachePipeline":
+        self._pipeline.get(key)
+        self._decoders.append(self.cache._decode)
+        return self
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> "CachePipeline":
+        self._pipeline.set(key, self.cache.codec.encode(value), ex=ttl or self.cache.default_ttl)
+        self._decoders.append(bool)
+        return self
+    
+    def set_if_not_exists(self, key: str, value: Any, ttl: Optional[int] = None) -> "CachePipeline":
+        self._pipeline.set(key, self.cache.codec.encode(value), ex=ttl or self.cache.default_ttl, nx=True)
+        self._decoders.append(bool)
+        return self
+    
+    def delete(self, key: str) -> "CachePipeline":
+        self._pipeline.delete(key)
+        self._decoders.append(bool)
+        return self
+    
+    def increment(self, key: str) -> "CachePipeline":
+        self._pipeline.incr(key)
+        self._decoders.append(int)
+        return self
+    
+    async def execute(self) -> List[Any]:
+        if not self._decoders:
+            return []
+        histogram = REDIS_COMMAND_DURATION.labels("transaction" if self.transaction else "pipeline")
+        start = time.perf_counter()
+        try:
+            replies = await self._pipeline.execute()
+        finally:
+            record_redis_command(histogram, time.perf_counter() - start)
+            await self._pipeline.reset()
+        results = [decode(reply) for decode, reply in zip(self._decoders, replies)]
+        self._decoders = []
+        return results
+
+
 class RedisCache:
-    """Redis cache client"""
+    """
+    Redis cache client.
     
-    def __init__(self):
-        self.redis_client = None
-        self.default_ttl = settings.REDIS_TTL
+    All instances share one connection pool per process. Values are encoded
+    with the configured codec (msgpack, compressed when large); use mget,
+    set_many or pipeline() to batch several commands into one round trip.
+    """
     
-    async def connect(self):
-        """Connect to Redis"""
-        if not self.redis_client:
-            self.redis_client = await redis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True
-            )
+    def __init__(self, pool: Optional[redis.ConnectionPool] = None, codec: Optional[Codec] = None):
+        self.redis_client = redis.Redis(connection_pool=pool or get_connection_pool())
+        self.codec = codec or get_codec(settings.REDIS_CODEC, settings.REDIS_COMPRESS_MIN_BYTES)
+        self.default_ttl = settings.REDIS_TTL
+        self._scripts = {}
     
     async def disconnect(self):
-        """Disconnect from Redis"""
-        if self.redis_client:
-            await self.redis_client.close()
+        """Close the pooled connections (they are reopened on demand)"""
+        await self.redis_client.connection_pool.disconnect()
+    
+    def _decode(self, value: Optional[bytes]) -> Optional[Any]:
+        return self.codec.decode(value) if value is not None else None
     
+    def pipeline(self, transaction: bool = False) -> CachePipeline:
+        """
+        Buffer commands and send them in one round trip. With transaction,
+        they are wrapped in MULTI/EXEC and applied atomically.
+        """
+        return CachePipeline(self, transaction)
+    
+    @timed
+    async def ping(self) -> bool:
+        """Round trip to Redis; unlike the other commands, raises on failure"""
+        return await self.redis_client.ping()
+    
+    @timed
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         try:
-            await self.connect()
-            value = await self.redis_client.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            return self._decode(await self.redis_client.get(key))
         except Exception as e:
-            logger.error(f"Redis get error: {str(e)}")
+            logger.error("Redis get error: %s", e)
             return None
     
+    @timed
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip (None for missing keys or on error)"""
+        if not keys:
+            return []
+        try:
+            return [self._decode(value) for value in await self.redis_client.mget(keys)]
+        except Exception as e:
+            logger.error("Redis mget error: %s", e)
+            return [None] * len(keys)
+    
+    @timed
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in cache"""
         try:
-            await self.connect()
             ttl = ttl or self.default_ttl
-            serialized = json.dumps(value)
-            await self.redis_client.setex(key, ttl, serialized)
+            await self.redis_client.setex(key, ttl, self.codec.encode(value))
             return True
         except Exception as e:
-            logger.error(f"Redis set error: {str(e)}")
+            logger.error("Redis set error: %s", e)
             return False
     
+    @timed
+    async def set_many(self, values: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values, each with the TTL, in one round trip"""
+        if not values:
+            return True
+        try:
+            ttl = ttl or self.default_ttl
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                for key, value in values.items():
+                    pipeline.set(key, self.codec.encode(value), ex=ttl)
+                await pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error("Redis set_many error: %s", e)
+            return False
+    
+    @timed
+    async def set_if_not_exists(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set value only if the key does not exist yet"""
+        try:
+            ttl = ttl or self.default_ttl
+            return bool(await self.redis_client.set(key, self.codec.encode(value), ex=ttl, nx=True))
+        except Exception as e:
+            logger.error("Redis set_if_not_exists error: %s", e)
+            return False
+    
+    @timed
+    async def get_or_set(self, key: str, value: Any, ttl: Optional[int] = None) -> Optional[Any]:
+        """
+        Return the current value of a key, storing `value` first if the key
+        does not exist (SET NX GET, one round trip; needs Redis 7).
+        None on error.
+        """
+        try:
+            ttl = ttl or self.default_ttl
+            existing = await self.redis_client.set(key, self.codec.encode(value), ex=ttl, nx=True, get=True)
+            return value if existing is None else self.codec.decode(existing)
+        except Exception as e:
+            logger.error("Redis get_or_set error: %s", e)
+            return None
+    
+    @timed
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         try:
-            await self.connect()
             await self.redis_client.delete(key)
             return True
         except Exception as e:
-            logger.error(f"Redis delete error: {str(e)}")
+            logger.error("Redis delete error: %s", e)
             return False
     
+    @timed
     async def increment(self, key: str) -> int:
         """Increment value"""
         try:
-            await self.connect()
             return await self.redis_client.incr(key)
         except Exception as e:
-            logger.error(f"Redis increment error: {str(e)}")
-            return 0
\ No newline at end of file
+            logger.error("Redis increment error: %s", e)
+            return 0
+    
+    @timed
+    async def run_script(self, script: str, keys: List[str], args: List[Any]) -> Optional[Any]:
+        """Run a Lua script atomically (EVALSHA, loading the script on first use)"""
+        try:
+            if script not in self._scripts:
+                self._scripts[script] = self.redis_client.register_script(script)
+            return await self._scripts[script](keys=keys, args=args)
+        except Exception as e:
+            logger.error("Redis script error: %s", e)
+            return None
+    
+    @timed
+    async def publish(self, channel: str, value: Any) -> int:
+        """
+        Publish a JSON message; returns the number of receiving subscribers.
+        Messages stay JSON whatever the cache codec, so every worker version
+        can read them.
+        """
+        try:
+            return await self.redis_client.publish(channel, json.dumps(value))
+        except Exception as e:
+            logger.error("Redis publish error: %s", e)
+            return 0
+    
+    async def subscribe(
+        self,
+        channel: str,
+        on_subscribed: Optional[Callable[[], None]] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Yield JSON messages published on a channel.
+        Uses a dedicated connection; errors are raised so the caller can
+        decide how to resubscribe. `on_subscribed` is called once Redis has
+        confirmed the subscription: every message published after that point
+        is delivered.
+        """
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+                elif message["type"] == "subscribe" and on_subscribed is not None:
+                    on_subscribed()
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Any, Dict, List
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, QueuePool
+
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class PoolMetrics:
+    """
+    Connection pool telemetry for one engine.
+    
+    Records how long checkouts wait for a connection, how many connections
+    are created, and how old the live connections are. Combined with the
+    pool's own in-use/overflow counters this is what is needed to size pools
+    per worker process.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connections_created = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self._connected_at: Dict[int, float] = {}
+    
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+    
+    def attach(self, engine) -> None:
+        """Register pool event listeners on an engine"""
+        self.pool = engine.pool
+        if isinstance(self.pool, _InstrumentedPoolMixin):
+            self.pool.metrics = self
+        
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connections_created += 1
+                self._connected_at[id(connection_record)] = time.monotonic()
+        
+        @event.listens_for(engine, "close")
+        def on_close(dbapi_connection, connection_record):
+            with self._lock:
+                self._connected_at.pop(id(connection_record), None)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool state and cumulative counters"""
+        now = time.monotonic()
+        with self._lock:
+            ages: List[float] = [now - connected for connected in self._connected_at.values()]
+            data = {
+                "checkouts": self.checkouts,
+                "connections_created": self.connections_created,
+                "checkout_wait_seconds_total": round(self.wait_seconds_total, 6),
+                "checkout_wait_seconds_max": round(self.wait_seconds_max, 6),
+                "checkout_wait_buckets": {
+                    ("+Inf" if bound == float("inf") else str(bound)): count
+                    for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)
+                },
+                "open_connections": len(ages),
+                "connection_age_seconds_max": round(max(ages), 1) if ages else 0.0,
+                "connection_age_seconds_avg": round(sum(ages) / len(ages), 1) if ages else 0.0,
+            }
+        
+        if isinstance(self.pool, QueuePool):
+            data.update({
+                "pool_size": self.pool.size(),
+                "checked_out": self.pool.checkedout(),
+                "checked_in": self.pool.checkedin(),
+                "overflow": max(self.pool.overflow(), 0),
+            })
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """Times how long each checkout waits for a connection"""
+    
+    metrics: PoolMetrics = None
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    pass
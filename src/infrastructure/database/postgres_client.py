@@ -1,18 +1,79 @@
-from sqlalchemy import create_engine, MetaData
+import logging
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from config.settings.base import DATABASE_CONFIG
 from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import instrument_engine
+from src.infrastructure.database.pool_metrics import (
+    PoolMetrics, InstrumentedQueuePool, InstrumentedNullPool
+)
+
+logger = get_logger(__name__)
+
+
+def get_engine_options(environment: str = settings.ENVIRONMENT) -> Dict[str, Any]:
+    """
+    Engine/pool options for an environment from config/database_config.yaml.
+    Note that the pool is per process: total connections are
+    workers x (pool_size + max_overflow).
+    """
+    db_config = DATABASE_CONFIG.get(environment) or DATABASE_CONFIG.get("default", {})
+    # Not passed to create_engine: its echo attaches a stdout handler of its
+    # own, bypassing the log queue. Raising the level keeps the configured
+    # `sqlalchemy` handlers.
+    for key, name in (("echo", "sqlalchemy.engine"), ("echo_pool", "sqlalchemy.pool")):
+        if db_config.get(key, False):
+            logging.getLogger(name).setLevel(logging.INFO)
+    options: Dict[str, Any] = {}
+    
+    if settings.DATABASE_POOL_MODE == "pgbouncer":
+        # PgBouncer in transaction mode owns the pooling; holding idle
+        # connections here would pin server connections for no benefit
+        options["poolclass"] = InstrumentedNullPool
+        return options
+    
+    pool_size = settings.DATABASE_POOL_SIZE
+    max_overflow = settings.DATABASE_MAX_OVERFLOW
+    options.update({
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size if pool_size is not None else db_config.get("pool_size", 10),
+        "max_overflow": max_overflow if max_overflow is not None else db_config.get("max_overflow", 20),
+        "pool_pre_ping": db_config.get("pool_pre_ping", True),
+        "pool_recycle": db_config.get("pool_recycle", 3600),
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    })
+    return options
+
 
 # Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+engine = create_engine(settings.DATABASE_URL, **get_engine_options())
+pool_metrics = {"primary": PoolMetrics("primary")}
+pool_metrics["primary"].attach(engine)
+instrument_engine(engine, "primary")
+
+# Optional read replica engine
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        connect_args={"connect_timeout": 2},
+        **get_engine_options()
+    )
+    pool_metrics["replica"] = PoolMetrics("replica")
+    pool_metrics["replica"].attach(replica_engine)
+    instrument_engine(replica_engine, "replica")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None else None
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -21,6 +82,80 @@ Base = declarative_base()
 metadata = MetaData()
 
 
+class ReplicaMonitor:
+    """
+    Tracks whether the read replica is usable.
+    
+    The replica is probed at most once per check interval; between probes the
+    cached verdict is used so routing costs nothing on the request path.
+    """
+    
+    # Replay lag in seconds; 0 when the replica has replayed everything it received
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+    
+    def __init__(self, replica, max_lag: float, check_interval: float):
+        self.replica = replica
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._healthy = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def is_available(self) -> bool:
+        """Return True if reads may be served by the replica"""
+        if self.replica is None:
+            return False
+        
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._healthy
+        
+        # Only one thread probes; the others keep using the last verdict
+        if not self._lock.acquire(blocking=False):
+            return self._healthy
+        try:
+            self._healthy = self._probe()
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._healthy
+    
+    def _probe(self) -> bool:
+        try:
+            with self.replica.connect() as conn:
+                lag = conn.execute(self.LAG_QUERY).scalar() or 0
+        except Exception as e:
+            logger.warning("Read replica unavailable, routing reads to primary: %s", e)
+            return False
+        
+        if lag > self.max_lag:
+            logger.warning("Read replica lagging %.1fs, routing reads to primary", lag)
+            return False
+        return True
+
+
+replica_monitor = ReplicaMonitor(
+    replica_engine,
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL
+)
+
+
+def get_read_session(prefer_primary: bool = False) -> Session:
+    """
+    Create a session for read-only work.
+    
+    Uses the replica when one is configured and healthy, unless the caller
+    asks for the primary (e.g. read-your-writes after a recent write).
+    """
+    if not prefer_primary and replica_monitor.is_available():
+        return ReplicaSessionLocal()
+    return SessionLocal()
+
+
 def get_db():
     """Get database session"""
     db = SessionLocal()
@@ -36,4 +171,8 @@ def init_db():
     from src.domain.models import task  # noqa
     
     # Create all tables
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    
+    # Partitioned tables need their partitions before the first insert
+    from src.workers.partition_maintenance import ensure_partitions
+    ensure_partitions(engine)
@@ -24,4 +24,8 @@ class BaseLLMClient(ABC):
         **kwargs
     ) -> List[float]:
         """Generate text embedding"""
+        pass
+    
+    async def close(self) -> None:
+        """Release network resources held by the client"""
         pass
\ No newline at end of file
@@ -55,7 +55,7 @@ class OllamaClient(BaseLLMClient):
                     raise Exception(f"Ollama error: {response.status_code}")
                     
         except Exception as e:
-            logger.error(f"Ollama API error: {str(e)}")
+            logger.error("Ollama API error: %s", e)
             raise
     
     async def generate_embedding(
@@ -81,5 +81,5 @@ class OllamaClient(BaseLLMClient):
                     raise Exception(f"Ollama error: {response.status_code}")
                     
         except Exception as e:
-            logger.error(f"Ollama Embedding API error: {str(e)}")
+            logger.error("Ollama Embedding API error: %s", e)
             raise
\ No newline at end of file
@@ -1,9 +1,11 @@
 from typing import Dict, Any, Optional, List
+import time
 import openai
 from openai import AsyncOpenAI
 from src.infrastructure.llm.base_client import BaseLLMClient
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.core.metrics import LLM_TOKENS, record_llm_call
 
 logger = get_logger(__name__)
 
@@ -27,6 +29,7 @@ class OpenAIClient(BaseLLMClient):
         **kwargs
     ) -> str:
         """Generate text completion"""
+        start = time.perf_counter()
         try:
             messages = []
             if system_message:
@@ -48,10 +51,16 @@ class OpenAIClient(BaseLLMClient):
             # Make API call
             response = await self.client.chat.completions.create(**params)
             
+            record_llm_call("openai", self.model, "success", time.perf_counter() - start)
+            if response.usage:
+                LLM_TOKENS.labels("openai", self.model, "prompt").inc(response.usage.prompt_tokens)
+                LLM_TOKENS.labels("openai", self.model, "completion").inc(response.usage.completion_tokens)
+            
             return response.choices[0].message.content
             
         except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
+            record_llm_call("openai", self.model, "error", time.perf_counter() - start)
+            logger.error("OpenAI API error: %s", e)
             raise
     
     async def generate_embedding(
@@ -67,5 +76,9 @@ class OpenAIClient(BaseLLMClient):
             )
             return response.data[0].embedding
         except Exception as e:
-            logger.error(f"OpenAI Embedding API error: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("OpenAI Embedding API error: %s", e)
+            raise
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self.client.close()
\ No newline at end of file
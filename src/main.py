@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # Filter the Host header of the request, allowing only hostnames defined (e.g. example.com, localhost)
@@ -9,7 +10,12 @@ from src.core.config import settings
 from src.core.logging import get_logger
 from src.api.v1.router import api_router
 from src.api.middleware.error_handler import ErrorHandlerMiddleware
+from src.api.middleware.auth import AuthMiddleware
+from src.api.middleware.rate_limiter import RateLimiterMiddleware
 from src.infrastructure.database.postgres_client import init_db
+from src.api.container import Container
+from src.core.metrics import MetricsMiddleware, monitor_event_loop_lag, render_metrics
+from src.services.task_stats import fold_task_stats_periodically
 
 logger = get_logger(__name__)
 
@@ -20,15 +26,25 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Task Assistant API...")
 
-    try:
-        init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+    if not settings.FAST_START:
+        try:
+            init_db()
+            logger.info("Database initialized successfully")
+        except Exception as e:
+            logger.error("Failed to initialize database: %s", e)
+    
+    # Long-lived clients and services shared by all requests
+    app.state.container = Container()
+    app.state.container.health.start()
+    loop_lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    stats_folder = asyncio.create_task(fold_task_stats_periodically())
     yield # Where the application starts running.
 
     # Shutdown
     logger.info("Shutting down Task Assistant API...")
+    loop_lag_monitor.cancel()
+    stats_folder.cancel()
+    await app.state.container.close()
 
 
 # Create FastAPI application
@@ -41,7 +57,11 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Add middlewares
+# Add middlewares (each one added wraps the previous ones)
+# Rate limiting runs inside AuthMiddleware so it can key on the verified user
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimiterMiddleware)
+app.add_middleware(AuthMiddleware)
 app.add_middleware(ErrorHandlerMiddleware)
 
 # CORS middleware
@@ -58,6 +78,9 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure based on your needs
 )
 
+# Outermost, so latency covers the whole stack and error responses are counted
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -69,4 +92,11 @@ async def root():
         "message": "Task Assistant API",
         "version": settings.VERSION,
         "docs": "/docs"
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
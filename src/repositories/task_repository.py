@@ -1,44 +1,162 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy import desc, and_, func, false, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
+import hashlib
+import re
 
 from src.repositories.base import BaseRepository
-from src.domain.models.task import TaskModel, TaskStepModel
+from src.repositories.task_stats_repository import TaskStatsRepository, TaskStatsSnapshot
+from src.domain.models.task import (
+    TaskModel, TaskStepModel, SourceTextModel, TaskTombstoneModel, TaskSyncHorizonModel,
+    SEARCH_CONFIG
+)
+from src.utils.compression import compress_text, decompress_text
+from src.utils.uuid7 import uuid7, uuid7_time_range
 from src.schemas.task import TaskCreate, TaskUpdate
 
 
 class TaskRepository(BaseRepository[TaskModel]):
     def __init__(self, db: Session):
         super().__init__(TaskModel, db)
+        self.stats = TaskStatsRepository(db)
         
     def create_with_steps(self, task_data: TaskCreate) -> TaskModel:
         """Create task with steps"""
-        # Create task
-        task_dict = task_data.model_dump(exclude={"steps"})
-        task = TaskModel(**task_dict)
+        task = self._add_with_steps(task_data)
+        self.db.commit()
+        self.db.refresh(task)
+        return task
+    
+    def create_many_with_steps(self, tasks_data: List[TaskCreate]) -> List[UUID]:
+        """Create several tasks with their steps in a single transaction"""
+        try:
+            tasks = [self._add_with_steps(task_data) for task_data in tasks_data]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [task.id for task in tasks]
+    
+    def _add_with_steps(self, task_data: TaskCreate) -> TaskModel:
+        """Add a task and its steps to the session without committing"""
+        # Create task; id and created_at are assigned here so steps can
+        # reference them without a flush per task. Ids carry created_at (see
+        # _by_id) and steps share the task's created_at.
+        task_dict = task_data.model_dump(exclude={"steps", "source_text"})
+        created_at = datetime.utcnow()
+        task = TaskModel(id=uuid7(created_at), created_at=created_at, **task_dict)
+        task.source_hash = self._store_source_text(task_data.source_text)
+        task.steps_text = "\n".join(step.description for step in task_data.steps)
         self.db.add(task)
-        self.db.flush()
         
         # Create steps
         for step_data in task_data.steps:
             step = TaskStepModel(
+                id=uuid7(task.created_at),
                 task_id=task.id,
+                created_at=task.created_at,
                 **step_data.model_dump()
             )
             self.db.add(step)
         
-        self.db.commit()
-        self.db.refresh(task)
+        self.stats.record_change(None, TaskStatsSnapshot(
+            category=task.category,
+            priority=task.priority,
+            is_completed=False,
+            step_count=len(task_data.steps),
+            steps_completed=sum(1 for step in task_data.steps if step.is_completed)
+        ))
+        self.stats.record_daily(task.created_at.date(), created=1)
         return task
     
+    def _store_source_text(self, text: str) -> str:
+        """Store source text once per distinct content and return its hash"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        codec, payload = compress_text(text)
+        
+        stmt = insert(SourceTextModel).values(
+            hash=digest,
+            codec=codec,
+            size=len(data),
+            payload=payload,
+            created_at=datetime.utcnow()
+        )
+        # Reuse refreshes created_at and locks the row until commit, so the
+        # orphan sweep cannot delete a blob a new task is about to reference
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["hash"],
+            set_={"created_at": stmt.excluded.created_at}
+        )
+        self.db.execute(stmt)
+        return digest
+    
+    @staticmethod
+    def _by_id(model, id: UUID) -> list:
+        """
+        Filters matching a task or step by id. Ids are UUIDv7 made from the
+        row's created_at, so the created_at range lets Postgres prune every
+        other monthly partition; the cold partition is found through its
+        (id, ...) primary key index. Ids from before UUIDv7 (version 4) have no
+        range and probe every partition.
+        """
+        filters = [model.id == id]
+        created_range = uuid7_time_range(id)
+        if created_range:
+            filters += [model.created_at >= created_range[0], model.created_at < created_range[1]]
+        return filters
+    
+    def get_source_text(self, task_id: UUID) -> Optional[str]:
+        """Load the raw source text of a task; None if the task does not exist"""
+        row = self.db.query(TaskModel.source_hash, SourceTextModel.codec, SourceTextModel.payload)\
+            .outerjoin(SourceTextModel, SourceTextModel.hash == TaskModel.source_hash)\
+            .filter(*self._by_id(TaskModel, task_id))\
+            .first()
+        if row is None:
+            return None
+        if row.payload is None:
+            return ""
+        return decompress_text(row.codec, row.payload)
+    
     def get_with_steps(self, task_id: UUID) -> Optional[TaskModel]:
         """Get task with all steps"""
-        return self.db.query(TaskModel)\
-            .options(joinedload(TaskModel.steps))\
-            .filter(TaskModel.id == task_id)\
-            .first()
+        # Steps share the task's created_at: the same range prunes task_steps
+        step_filters = self._by_id(TaskStepModel, task_id)[1:]
+        # One row per step, so no LIMIT
+        tasks = self.db.query(TaskModel)\
+            .outerjoin(TaskModel.steps.and_(*step_filters))\
+            .options(contains_eager(TaskModel.steps))\
+            .filter(*self._by_id(TaskModel, task_id))\
+            .order_by(TaskStepModel.order_index)\
+            .all()
+        return tasks[0] if tasks else None
+    
+    def get_step(self, step_id: UUID) -> Optional[TaskStepModel]:
+        """Get a step by id"""
+        return self.db.query(TaskStepModel).filter(*self._by_id(TaskStepModel, step_id)).first()
+    
+    @staticmethod
+    def _task_filters(
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False
+    ) -> list:
+        """Build the filter clauses shared by list, search, count and export"""
+        filters = []
+        if category:
+            filters.append(TaskModel.category == category)
+        if priority:
+            filters.append(TaskModel.priority == priority)
+        if is_completed is not None:
+            filters.append(TaskModel.is_completed == is_completed)
+        if not include_archived:
+            # Lets the planner prune the cold partition
+            filters.append(TaskModel.is_archived == false())
+        return filters
     
     def list_tasks(
         self,
@@ -47,19 +165,14 @@ class TaskRepository(BaseRepository[TaskModel]):
         category: Optional[str] = None,
         priority: Optional[str] = None,
         is_completed: Optional[bool] = None,
-        order_by: str = "created_at"
+        order_by: str = "created_at",
+        include_archived: bool = False
     ) -> List[TaskModel]:
         """List tasks with filters"""
         query = self.db.query(TaskModel).options(joinedload(TaskModel.steps))
         
         # Apply filters
-        filters = []
-        if category:
-            filters.append(TaskModel.category == category)
-        if priority:
-            filters.append(TaskModel.priority == priority)
-        if is_completed is not None:
-            filters.append(TaskModel.is_completed == is_completed)
+        filters = self._task_filters(category, priority, is_completed, include_archived)
         
         if filters:
             query = query.filter(and_(*filters))
@@ -76,6 +189,122 @@ class TaskRepository(BaseRepository[TaskModel]):
         
         return query.offset(skip).limit(limit).all()
     
+    def search_tasks(
+        self,
+        query_text: str,
+        skip: int = 0,
+        limit: int = 20,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False
+    ) -> List[TaskModel]:
+        """Full-text search over title, description and step text, best match first"""
+        ts_query = self._build_prefix_tsquery(query_text)
+        if not ts_query:
+            return []
+        
+        tsquery = func.to_tsquery(SEARCH_CONFIG, ts_query)
+        query = self.db.query(TaskModel)\
+            .options(joinedload(TaskModel.steps))\
+            .filter(TaskModel.search_vector.op("@@")(tsquery))
+        
+        filters = self._task_filters(category, priority, is_completed, include_archived)
+        
+        if filters:
+            query = query.filter(and_(*filters))
+        
+        query = query.order_by(
+            desc(func.ts_rank_cd(TaskModel.search_vector, tsquery)),
+            desc(TaskModel.created_at)
+        )
+        
+        return query.offset(skip).limit(limit).all()
+    
+    def iter_export_batches(
+        self,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False,
+        include_source: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream tasks as plain dicts (with a "steps" list) in batches.
+        With include_source, each task also carries its "source_text"
+        ("" for tasks without one).
+        
+        Rows come from a server-side cursor and are never loaded as ORM
+        objects, so memory stays bounded by batch_size regardless of how
+        many tasks are exported.
+        """
+        columns = [
+            TaskModel.id,
+            TaskModel.title,
+            TaskModel.description,
+            TaskModel.priority,
+            TaskModel.category,
+            TaskModel.is_completed,
+            TaskModel.is_archived,
+            TaskModel.created_at,
+            TaskModel.completed_at
+        ]
+        if include_source:
+            columns += [SourceTextModel.codec, SourceTextModel.payload]
+        stmt = select(*columns)
+        if include_source:
+            stmt = stmt.outerjoin(SourceTextModel, SourceTextModel.hash == TaskModel.source_hash)
+        filters = self._task_filters(category, priority, is_completed, include_archived)
+        if filters:
+            stmt = stmt.where(and_(*filters))
+        stmt = stmt.order_by(TaskModel.created_at, TaskModel.id)\
+            .execution_options(stream_results=True, yield_per=batch_size)
+        
+        result = self.db.execute(stmt).mappings()
+        for partition in result.partitions():
+            tasks = [dict(row, steps=[]) for row in partition]
+            if include_source:
+                for task in tasks:
+                    codec, payload = task.pop("codec"), task.pop("payload")
+                    task["source_text"] = decompress_text(codec, payload) if payload is not None else ""
+            by_id = {task["id"]: task for task in tasks}
+            
+            # One query per batch; the created_at range prunes step partitions
+            steps = self.db.execute(
+                select(
+                    TaskStepModel.task_id,
+                    TaskStepModel.description,
+                    TaskStepModel.order_index,
+                    TaskStepModel.is_completed
+                )
+                .where(
+                    TaskStepModel.task_id.in_(list(by_id)),
+                    TaskStepModel.created_at.between(
+                        tasks[0]["created_at"], tasks[-1]["created_at"]
+                    )
+                )
+                .order_by(TaskStepModel.task_id, TaskStepModel.order_index)
+            ).mappings()
+            for step in steps:
+                by_id[step["task_id"]]["steps"].append({
+                    "description": step["description"],
+                    "order_index": step["order_index"],
+                    "is_completed": step["is_completed"]
+                })
+            
+            yield tasks
+    
+    @staticmethod
+    def _build_prefix_tsquery(query_text: str) -> str:
+        """
+        Turn free user input into a tsquery where every term is a prefix match,
+        e.g. "write rep" -> "write:* & rep:*". Operators typed by the user are
+        dropped so the input can never produce a tsquery syntax error.
+        """
+        terms = re.findall(r"\w+", query_text.lower())
+        return " & ".join(f"{term}:*" for term in terms)
+    
     def update_task(self, task_id: UUID, update_data: TaskUpdate) -> Optional[TaskModel]:
         """Update task"""
         task = self.get_with_steps(task_id)
@@ -83,6 +312,8 @@ class TaskRepository(BaseRepository[TaskModel]):
             return None
         
         update_dict = update_data.model_dump(exclude_unset=True)
+        before = self.stats.snapshot(task)
+        previous_completed_at = task.completed_at
         
         # Handle completion
         if "is_completed" in update_dict and update_dict["is_completed"]:
@@ -91,44 +322,120 @@ class TaskRepository(BaseRepository[TaskModel]):
         for field, value in update_dict.items():
             setattr(task, field, value)
         
+        self._record_stats(task, before, previous_completed_at)
         self.db.commit()
         self.db.refresh(task)
         return task
     
     def update_step_completion(self, step_id: UUID, is_completed: bool) -> bool:
         """Update step completion status"""
-        step = self.db.query(TaskStepModel).filter(TaskStepModel.id == step_id).first()
+        step = self.get_step(step_id)
         if not step:
             return False
         
+        # Not step.task: that join has no partition key
+        task = self.get_with_steps(step.task_id)
+        if not task:
+            return False
+        before = self.stats.snapshot(task)
+        previous_completed_at = task.completed_at
+        
         step.is_completed = is_completed
+        # Step changes do not touch the task row by themselves; bump its
+        # updated_at so it gets a new change_seq for delta sync
+        task.updated_at = datetime.utcnow()
         
         # Check if all steps are completed
-        task = step.task
         all_completed = all(s.is_completed for s in task.steps)
         if all_completed and not task.is_completed:
             task.is_completed = True
             task.completed_at = datetime.utcnow()
         
+        self._record_stats(task, before, previous_completed_at)
         self.db.commit()
         return True
     
+    def delete(self, id: UUID) -> bool:
+        """Delete a task and remove it from the stats rollups"""
+        task = self.get_with_steps(id)
+        if not task:
+            return False
+        
+        self.stats.record_change(self.stats.snapshot(task), None)
+        self.db.delete(task)
+        self.db.add(TaskTombstoneModel(task_id=id))
+        self.db.commit()
+        return True
+    
+    def get_snapshot_xmin(self) -> int:
+        """Oldest transaction id still running: every lower one has finished"""
+        return self.db.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+    
+    def list_changes(
+        self,
+        floor: int,
+        after: Optional[Tuple[int, int]],
+        limit: int
+    ) -> Tuple[List[TaskModel], List[TaskTombstoneModel]]:
+        """
+        Tasks and tombstones written by transactions from `floor` on, in
+        (change_txid, change_seq) order and past the `after` position if
+        given, up to limit + 1 of each (the extra row tells the caller there
+        is more). A full sync (floor == 0) skips tombstones and archived tasks.
+        """
+        def changed(model):
+            condition = model.change_txid >= floor
+            if after:
+                condition = and_(condition, tuple_(model.change_txid, model.change_seq) > tuple_(*after))
+            return condition
+        
+        query = self.db.query(TaskModel)\
+            .options(joinedload(TaskModel.steps))\
+            .filter(changed(TaskModel))
+        if not floor:
+            query = query.filter(TaskModel.is_archived == false())
+        tasks = query.order_by(TaskModel.change_txid, TaskModel.change_seq).limit(limit + 1).all()
+        
+        tombstones = []
+        if floor:
+            tombstones = self.db.query(TaskTombstoneModel)\
+                .filter(changed(TaskTombstoneModel))\
+                .order_by(TaskTombstoneModel.change_txid, TaskTombstoneModel.change_seq)\
+                .limit(limit + 1)\
+                .all()
+        return tasks, tombstones
+    
+    def get_sync_horizon(self) -> int:
+        """change_txid through which tombstones have been compacted"""
+        horizon = self.db.get(TaskSyncHorizonModel, 1)
+        return horizon.compacted_through if horizon else 0
+    
+    def _record_stats(
+        self,
+        task: TaskModel,
+        before: TaskStatsSnapshot,
+        previous_completed_at: Optional[datetime]
+    ) -> None:
+        """Apply a task's rollup changes within the current transaction"""
+        after = self.stats.snapshot(task)
+        self.stats.record_change(before, after)
+        
+        if after.is_completed and not before.is_completed:
+            self.stats.record_daily(task.completed_at.date(), completed=1)
+        elif before.is_completed and not after.is_completed and previous_completed_at:
+            self.stats.record_daily(previous_completed_at.date(), completed=-1)
+    
     def count_tasks(
         self,
         category: Optional[str] = None,
         priority: Optional[str] = None,
-        is_completed: Optional[bool] = None
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False
     ) -> int:
         """Count tasks with filters"""
         query = self.db.query(TaskModel)
         
-        filters = []
-        if category:
-            filters.append(TaskModel.category == category)
-        if priority:
-            filters.append(TaskModel.priority == priority)
-        if is_completed is not None:
-            filters.append(TaskModel.is_completed == is_completed)
+        filters = self._task_filters(category, priority, is_completed, include_archived)
         
         if filters:
             query = query.filter(and_(*filters))
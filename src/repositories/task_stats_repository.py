@@ -0,0 +1,226 @@
+from typing import Any, List, NamedTuple, Optional
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import BigInteger, cast, func, delete, select, text, union_all
+
+from src.domain.models.task import (
+    TaskModel, TaskStepModel, TaskStatsModel, TaskDailyStatsModel,
+    TaskStatsDeltaModel, TaskDailyStatsDeltaModel
+)
+
+# Serializes folding (and rebuilds) across workers
+FOLD_LOCK_ID = 0x7461736B  # "task"
+
+FOLD_BUCKETS_SQL = text("""
+    WITH folded AS (
+        DELETE FROM task_stats_deltas
+        RETURNING category, priority, is_completed, task_count, step_count, steps_completed
+    )
+    INSERT INTO task_stats (category, priority, is_completed, task_count, step_count, steps_completed)
+    SELECT category, priority, is_completed, sum(task_count), sum(step_count), sum(steps_completed)
+    FROM folded
+    GROUP BY category, priority, is_completed
+    ORDER BY category, priority, is_completed
+    ON CONFLICT (category, priority, is_completed) DO UPDATE SET
+        task_count = task_stats.task_count + EXCLUDED.task_count,
+        step_count = task_stats.step_count + EXCLUDED.step_count,
+        steps_completed = task_stats.steps_completed + EXCLUDED.steps_completed
+""")
+
+FOLD_DAILY_SQL = text("""
+    WITH folded AS (
+        DELETE FROM task_stats_daily_deltas
+        RETURNING day, created_count, completed_count
+    )
+    INSERT INTO task_stats_daily (day, created_count, completed_count)
+    SELECT day, sum(created_count), sum(completed_count)
+    FROM folded
+    GROUP BY day
+    ORDER BY day
+    ON CONFLICT (day) DO UPDATE SET
+        created_count = task_stats_daily.created_count + EXCLUDED.created_count,
+        completed_count = task_stats_daily.completed_count + EXCLUDED.completed_count
+""")
+
+
+class TaskStatsSnapshot(NamedTuple):
+    """The part of a task that contributes to the stats rollups"""
+    category: str
+    priority: str
+    is_completed: bool
+    step_count: int
+    steps_completed: int
+
+
+class TaskStatsRepository:
+    """
+    Maintains and reads the task stats rollup tables.
+    
+    Write methods only add insert-only delta rows to the session, so the
+    caller's commit makes the change atomic with the task change without
+    locking shared counter rows: concurrent writers never wait on each other.
+    fold_deltas() moves the deltas into the rollups; reads add the deltas not
+    folded yet, so stats are exact either way.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def snapshot(task: TaskModel) -> TaskStatsSnapshot:
+        """Capture a task's stats contribution (loads its steps if needed)"""
+        return TaskStatsSnapshot(
+            category=task.category,
+            priority=task.priority,
+            is_completed=bool(task.is_completed),
+            step_count=len(task.steps),
+            steps_completed=sum(1 for step in task.steps if step.is_completed)
+        )
+    
+    def record_change(
+        self,
+        before: Optional[TaskStatsSnapshot],
+        after: Optional[TaskStatsSnapshot]
+    ) -> None:
+        """Apply the difference between two snapshots (None = task absent)"""
+        if before == after:
+            return
+        if before and after and before[:3] == after[:3]:
+            self._apply(
+                before,
+                tasks=0,
+                steps=after.step_count - before.step_count,
+                steps_completed=after.steps_completed - before.steps_completed
+            )
+            return
+        if before:
+            self._apply(before, -1, -before.step_count, -before.steps_completed)
+        if after:
+            self._apply(after, 1, after.step_count, after.steps_completed)
+    
+    def _apply(self, bucket: TaskStatsSnapshot, tasks: int, steps: int, steps_completed: int) -> None:
+        self.db.add(TaskStatsDeltaModel(
+            category=bucket.category,
+            priority=bucket.priority,
+            is_completed=bucket.is_completed,
+            task_count=tasks,
+            step_count=steps,
+            steps_completed=steps_completed
+        ))
+    
+    def record_daily(self, day: date, created: int = 0, completed: int = 0) -> None:
+        """Add to the created/completed counters of a day"""
+        self.db.add(TaskDailyStatsDeltaModel(
+            day=day,
+            created_count=created,
+            completed_count=completed
+        ))
+    
+    def get_buckets(self) -> List[Any]:
+        """
+        Rollup rows with pending deltas added (TaskStatsModel attributes);
+        bounded by categories x priorities x 2
+        """
+        rows = union_all(*(
+            select(
+                model.category, model.priority, model.is_completed,
+                model.task_count, model.step_count, model.steps_completed
+            )
+            for model in (TaskStatsModel, TaskStatsDeltaModel)
+        )).subquery()
+        return self.db.execute(
+            select(
+                rows.c.category,
+                rows.c.priority,
+                rows.c.is_completed,
+                cast(func.sum(rows.c.task_count), BigInteger).label("task_count"),
+                cast(func.sum(rows.c.step_count), BigInteger).label("step_count"),
+                cast(func.sum(rows.c.steps_completed), BigInteger).label("steps_completed")
+            ).group_by(rows.c.category, rows.c.priority, rows.c.is_completed)
+        ).all()
+    
+    def get_daily(self, days: int) -> List[Any]:
+        """
+        Daily counters for the last `days` days with pending deltas added
+        (TaskDailyStatsModel attributes), oldest first
+        """
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        rows = union_all(*(
+            select(model.day, model.created_count, model.completed_count).where(model.day >= since)
+            for model in (TaskDailyStatsModel, TaskDailyStatsDeltaModel)
+        )).subquery()
+        return self.db.execute(
+            select(
+                rows.c.day,
+                cast(func.sum(rows.c.created_count), BigInteger).label("created_count"),
+                cast(func.sum(rows.c.completed_count), BigInteger).label("completed_count")
+            ).group_by(rows.c.day).order_by(rows.c.day)
+        ).all()
+    
+    def fold_deltas(self) -> bool:
+        """
+        Move pending deltas into the rollup rows and commit. Rows are updated
+        in key order, and only one worker folds at a time; returns False if
+        another one was already folding.
+        """
+        if not self.db.execute(select(func.pg_try_advisory_xact_lock(FOLD_LOCK_ID))).scalar():
+            self.db.rollback()
+            return False
+        self.db.execute(FOLD_BUCKETS_SQL)
+        self.db.execute(FOLD_DAILY_SQL)
+        self.db.commit()
+        return True
+    
+    def rebuild(self) -> None:
+        """
+        Recompute both rollups from the tasks table. Scans every task, so it is
+        only meant for backfilling existing data or repairing drift.
+        """
+        self.db.execute(select(func.pg_advisory_xact_lock(FOLD_LOCK_ID)))
+        step_counts = select(
+            TaskStepModel.task_id,
+            func.count().label("step_count"),
+            func.count().filter(TaskStepModel.is_completed).label("steps_completed")
+        ).group_by(TaskStepModel.task_id).subquery()
+        
+        buckets = self.db.query(
+            TaskModel.category,
+            TaskModel.priority,
+            TaskModel.is_completed,
+            func.count(TaskModel.id),
+            func.coalesce(func.sum(step_counts.c.step_count), 0),
+            func.coalesce(func.sum(step_counts.c.steps_completed), 0)
+        ).outerjoin(step_counts, step_counts.c.task_id == TaskModel.id)\
+            .group_by(TaskModel.category, TaskModel.priority, TaskModel.is_completed)\
+            .all()
+        
+        created = dict(
+            self.db.query(func.date(TaskModel.created_at), func.count())
+            .group_by(func.date(TaskModel.created_at)).all()
+        )
+        completed = dict(
+            self.db.query(func.date(TaskModel.completed_at), func.count())
+            .filter(TaskModel.is_completed, TaskModel.completed_at.isnot(None))
+            .group_by(func.date(TaskModel.completed_at)).all()
+        )
+        
+        self.db.execute(delete(TaskStatsModel))
+        self.db.execute(delete(TaskDailyStatsModel))
+        self.db.execute(delete(TaskStatsDeltaModel))
+        self.db.execute(delete(TaskDailyStatsDeltaModel))
+        for category, priority, is_completed, task_count, step_count, steps_completed in buckets:
+            self.db.add(TaskStatsModel(
+                category=category,
+                priority=priority,
+                is_completed=is_completed,
+                task_count=task_count,
+                step_count=step_count,
+                steps_completed=steps_completed
+            ))
+        for day in set(created) | set(completed):
+            self.db.add(TaskDailyStatsModel(
+                day=day,
+                created_count=created.get(day, 0),
+                completed_count=completed.get(day, 0)
+            ))
+        self.db.commit()
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+class BatchOperation(BaseModel):
+    """One sub-request; `path` is a task route, e.g. "/{task_id}" or "/api/v1/AI Tasks/{task_id}" """
+    id: Optional[str] = None  # echoed back to match results to operations
+    method: Literal["GET", "POST", "PATCH", "DELETE"]
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=100)
+    atomic: bool = False  # all operations commit together or not at all
+
+
+class BatchOperationResult(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchOperationResult]
+    committed: bool
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, Field
 from typing import Dict, List, Any, Optional
 from uuid import UUID
@@ -54,15 +54,22 @@ class TaskUpdate(BaseModel):
 
 class Task(TaskBase):
     id: UUID
+    source_text: Optional[str] = None  # only loaded on request, see TaskSource
     steps: List[TaskStep] = []
     is_completed: bool = False
     created_at: datetime
     completed_at: Optional[datetime] = None
+    is_archived: bool = False
     
     class Config:
         from_attributes = True
 
 
+class TaskSource(BaseModel):
+    task_id: UUID
+    source_text: str
+
+
 class TaskResponse(BaseModel):
     task: Task
     confidence: float = Field(default=1.0, ge=0.0, le=1.0)
@@ -72,4 +79,92 @@ class TaskListResponse(BaseModel):
     tasks: List[Task]
     total: int
     page: int
-    page_size: int
\ No newline at end of file
+    page_size: int
+
+class TaskSearchResponse(BaseModel):
+    tasks: List[Task]
+    query: str
+    page: int
+    page_size: int
+
+
+class TaskChanges(BaseModel):
+    """
+    One page of delta sync. Upsert `tasks` (drop those with is_archived),
+    remove `deleted`, then request again with since=cursor while has_more.
+    On reset, discard the local copy and sync again from since=0.
+    """
+    tasks: List[Task]
+    deleted: List[UUID]
+    cursor: str  # opaque
+    has_more: bool
+    reset: bool = False
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    skipped: int = 0
+    last_committed_line: int = 0
+    errors: List[TaskImportError] = []
+    errors_truncated: bool = False
+
+
+
+class TaskStatsBreakdown(BaseModel):
+    key: str
+    total: int
+    completed: int
+
+
+class TaskDailyStats(BaseModel):
+    day: date
+    created: int
+    completed: int
+
+
+class TaskStats(BaseModel):
+    total: int
+    completed: int
+    open: int
+    completion_rate: float
+    by_category: List[TaskStatsBreakdown]
+    by_priority: List[TaskStatsBreakdown]
+    step_count: int
+    steps_completed: int
+    step_progress: float
+    daily: List[TaskDailyStats]
+
+
+# Fast serialization path for read endpoints. Builds the JSON form of Task
+# (as produced by Task.model_dump(mode="json")) straight from ORM rows,
+# skipping model validation; keep in sync with TaskStep and Task above.
+
+def step_to_dict(step) -> Dict[str, Any]:
+    return {
+        "description": step.description,
+        "order_index": step.order_index,
+        "is_completed": step.is_completed,
+        "id": str(step.id)
+    }
+
+
+def task_to_dict(task) -> Dict[str, Any]:
+    return {
+        "title": task.title,
+        "description": task.description,
+        "priority": task.priority,
+        "category": task.category,
+        "source_text": task.source_text,
+        "id": str(task.id),
+        "steps": [step_to_dict(step) for step in task.steps],
+        "is_completed": task.is_completed,
+        "created_at": task.created_at.isoformat(),
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "is_archived": task.is_archived
+    }
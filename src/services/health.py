@@ -0,0 +1,155 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from src.infrastructure.cache.redis import RedisCache
+from src.infrastructure.database.postgres_client import engine
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class HealthChecker:
+    """
+    Dependency checks run by one background task per worker.
+    
+    Each dependency is probed on its own interval with a timeout and the
+    outcome is cached, so liveness/readiness requests only read memory: a
+    burst of probes from the orchestrator never reaches Postgres, Redis or
+    the LLM APIs. Optional dependencies (OpenAI without an API key, Ollama
+    without OLLAMA_BASE_URL) are not checked.
+    """
+    
+    # How often the loop wakes to see which checks are due
+    TICK = 1.0
+    
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        interval: Optional[float] = None,
+        llm_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        readiness_checks: Optional[List[str]] = None
+    ):
+        self.cache = cache or RedisCache()
+        self.timeout = timeout or settings.HEALTH_CHECK_TIMEOUT
+        self.readiness_checks = readiness_checks if readiness_checks is not None else settings.HEALTH_READINESS_CHECKS
+        interval = interval or settings.HEALTH_CHECK_INTERVAL
+        llm_interval = llm_interval or settings.HEALTH_LLM_CHECK_INTERVAL
+        
+        self.checks: Dict[str, Tuple[Callable[[], Awaitable[Any]], float]] = {
+            "postgres": (self._check_postgres, interval),
+            "redis": (self._check_redis, interval),
+        }
+        if settings.OPENAI_API_KEY:
+            self.checks["openai"] = (self._check_openai, llm_interval)
+        if settings.OLLAMA_BASE_URL:
+            self.checks["ollama"] = (self._check_ollama, llm_interval)
+        
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._due: Dict[str, float] = {}
+        self._heartbeat: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def start(self) -> None:
+        """Start the background checker (from the lifespan hook)"""
+        if self._task is None:
+            self._http = httpx.AsyncClient(timeout=self.timeout)
+            self._task = asyncio.create_task(self._run())
+    
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    def liveness(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Alive while the checker loop keeps running: a dead task or an event
+        loop blocked for several ticks fails liveness. Dependencies are not
+        considered, so an outage elsewhere does not get workers restarted.
+        """
+        if self._heartbeat is None:
+            return True, {"status": "starting"}
+        stalled = time.monotonic() - self._heartbeat
+        alive = self._task is not None and not self._task.done() and stalled < max(
+            5 * self.TICK, 2 * self.timeout + self.TICK
+        )
+        return alive, {"status": "alive" if alive else "stalled", "last_tick_seconds_ago": round(stalled, 3)}
+    
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """Ready once every readiness check has passed on its latest run"""
+        ready = all(
+            self.results.get(name, {}).get("status") == "ok"
+            for name in self.readiness_checks if name in self.checks
+        )
+        return ready, {"status": "ready" if ready else "not_ready", "checks": self.results}
+    
+    async def _run(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            due = [name for name in self.checks if self._due.get(name, 0) <= self._heartbeat]
+            if due:
+                await asyncio.gather(*(self._run_check(name) for name in due))
+            await asyncio.sleep(self.TICK)
+    
+    async def _run_check(self, name: str) -> None:
+        check, interval = self.checks[name]
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            status, error = "error", f"timed out after {self.timeout}s"
+        except Exception as e:
+            status, error = "error", str(e) or type(e).__name__
+        
+        previous = self.results.get(name, {}).get("status")
+        if status != previous:
+            if status == "ok":
+                logger.info("Health check %s passing", name)
+            else:
+                logger.warning("Health check %s failing: %s", name, error)
+        
+        self.results[name] = {
+            "status": status,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "checked_at": datetime.utcnow().isoformat(),
+            "error": error,
+        }
+        self._due[name] = time.monotonic() + interval
+    
+    async def _check_postgres(self) -> None:
+        def select_one():
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        
+        await run_in_threadpool(select_one)
+    
+    async def _check_redis(self) -> None:
+        await self.cache.ping()
+    
+    async def _check_openai(self) -> None:
+        # Metadata for the configured model: authenticated, free and cheap
+        response = await self._http.get(
+            f"https://api.openai.com/v1/models/{settings.OPENAI_MODEL}",
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+        )
+        response.raise_for_status()
+    
+    async def _check_ollama(self) -> None:
+        response = await self._http.get(f"{settings.OLLAMA_BASE_URL.rstrip('/')}/api/tags")
+        response.raise_for_status()
@@ -0,0 +1,120 @@
+from typing import Any, Awaitable, Callable, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import time
+
+from pydantic import BaseModel
+
+from src.infrastructure.cache.redis import RedisCache
+from src.core.config import settings
+from src.core.exceptions import AppException
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key support for non-idempotent POST endpoints.
+    
+    The first request with a key claims it in Redis (SET NX) and runs; its
+    response is then stored under the key for `ttl` seconds and replayed to
+    any retry with the same key. A duplicate that arrives while the first is
+    still running waits for its result instead of executing again. A key
+    reused with a different payload is rejected. Failed requests release the
+    key so the client can retry them. If Redis is unavailable requests run
+    without idempotency protection.
+    """
+    
+    PREFIX = "idempotency"
+    
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        ttl: Optional[int] = None,
+        lock_ttl: Optional[int] = None
+    ):
+        self.cache = cache or RedisCache()
+        self.ttl = ttl or settings.IDEMPOTENCY_TTL
+        self.lock_ttl = lock_ttl or settings.IDEMPOTENCY_LOCK_TTL
+    
+    @staticmethod
+    def fingerprint(payload: Any) -> str:
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+        ).hexdigest()
+    
+    async def run(
+        self,
+        scope: str,
+        key: str,
+        payload: Any,
+        operation: Callable[[], Awaitable[BaseModel]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run `operation` at most once per (scope, key).
+        Returns the JSON response body and whether it was replayed.
+        """
+        cache_key = f"{self.PREFIX}:{scope}:{key}"
+        fingerprint = self.fingerprint(payload)
+        deadline = time.monotonic() + self.lock_ttl
+        delay = 0.05
+        misses = 0
+        
+        while True:
+            claimed = await self.cache.set_if_not_exists(
+                cache_key,
+                {"state": "in_progress", "fingerprint": fingerprint},
+                ttl=self.lock_ttl
+            )
+            if claimed:
+                return await self._execute(cache_key, fingerprint, operation), False
+            
+            record = await self.cache.get(cache_key)
+            if record is None:
+                # Released or expired between the two calls; a second miss in
+                # a row means Redis is not answering
+                misses += 1
+                if misses > 1:
+                    logger.error("Idempotency store unavailable, running %s without it", scope)
+                    return (await operation()).model_dump(mode="json"), False
+                continue
+            misses = 0
+            
+            if record["fingerprint"] != fingerprint:
+                raise AppException(
+                    message="Idempotency-Key was already used with a different request",
+                    error_code="IDEMPOTENCY_KEY_REUSED",
+                    status_code=422
+                )
+            if record["state"] == "done":
+                return record["body"], True
+            if time.monotonic() > deadline:
+                raise AppException(
+                    message="A request with this Idempotency-Key is still in progress",
+                    error_code="IDEMPOTENCY_REQUEST_IN_PROGRESS",
+                    status_code=409
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    
+    async def _execute(
+        self,
+        cache_key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[BaseModel]]
+    ) -> Any:
+        try:
+            result = await operation()
+        except BaseException:
+            await self.cache.delete(cache_key)
+            raise
+        
+        body = result.model_dump(mode="json")
+        await self.cache.set(
+            cache_key,
+            {"state": "done", "fingerprint": fingerprint, "body": body},
+            ttl=self.ttl
+        )
+        return body
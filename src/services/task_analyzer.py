@@ -1,8 +1,7 @@
 from typing import Dict, List, Optional
 import json
-from openai import OpenAI, RateLimitError, APIError
 from src.schemas.task import TaskCreate, TaskStepCreate, TextInput
-from src.infrastructure.llm.providers.openai_client import OpenAIClient
+from src.infrastructure.llm.base_client import BaseLLMClient
 from src.core.logging import get_logger
 from src.core.exceptions import AppException
 
@@ -10,13 +9,47 @@ logger = get_logger(__name__)
 
 
 class TaskAnalyzerService:
-    def __init__(self):
-        self.llm_client = OpenAIClient()
+    SYSTEM_MESSAGE = """You are a task extraction specialist. Analyze the given text and extract actionable tasks.
+        
+        Return a JSON object with the following structure:
+        {
+            "title": "Short, clear task title (max 50 chars)",
+            "description": "Detailed description of what needs to be done",
+            "priority": "high|medium|low (based on urgency indicators in text)",
+            "category": "work|personal|meeting|research|general",
+            "steps": [
+                {"description": "Step 1 description"},
+                {"description": "Step 2 description"}
+            ]
+        }
+        """
+    
+    # Fallback tasks get a short summary; the full input is the source text
+    FALLBACK_DESCRIPTION_LENGTH = 500
+    
+    def __init__(self, llm_client: Optional[BaseLLMClient] = None):
+        self._llm_client = llm_client
+    
+    @property
+    def llm_client(self) -> BaseLLMClient:
+        # The OpenAI SDK is slow to import, so the default client is only
+        # created when the first text is analyzed
+        if self._llm_client is None:
+            from src.infrastructure.llm.providers.openai_client import OpenAIClient
+            self._llm_client = OpenAIClient()
+        return self._llm_client
+    
+    async def close(self) -> None:
+        """Close the LLM client if one was created"""
+        if self._llm_client is not None:
+            await self._llm_client.close()
         
     async def analyze_text(self, text_input: TextInput) -> TaskCreate:
         """
         Analyze text and extract task information using LLM
         """
+        from openai import RateLimitError, APIError
+        
         prompt = self._build_analysis_prompt(text_input.text, text_input.context)
         
         try:
@@ -49,13 +82,13 @@ class TaskAnalyzerService:
             )
             
         except RateLimitError as e:
-            logger.error(f"OpenAI rate limit error: {str(e)}")
+            logger.error("OpenAI rate limit error: %s", e)
             # Use fallback when rate limited
             logger.info("Using fallback task creation due to rate limit")
             return self._create_fallback_task(text_input.text)
             
         except APIError as e:
-            logger.error(f"OpenAI API error: {str(e)}")
+            logger.error("OpenAI API error: %s", e)
             if "insufficient_quota" in str(e):
                 raise AppException(
                     message="OpenAI API quota exceeded. Please check your billing.",
@@ -65,24 +98,11 @@ class TaskAnalyzerService:
             return self._create_fallback_task(text_input.text)
             
         except Exception as e:
-            logger.error(f"Error analyzing text: {str(e)}")
+            logger.error("Error analyzing text: %s", e)
             return self._create_fallback_task(text_input.text)
     
     def _get_system_message(self) -> str:
-        return """You are a task extraction specialist. Analyze the given text and extract actionable tasks.
-        
-        Return a JSON object with the following structure:
-        {
-            "title": "Short, clear task title (max 50 chars)",
-            "description": "Detailed description of what needs to be done",
-            "priority": "high|medium|low (based on urgency indicators in text)",
-            "category": "work|personal|meeting|research|general",
-            "steps": [
-                {"description": "Step 1 description"},
-                {"description": "Step 2 description"}
-            ]
-        }
-        """
+        return self.SYSTEM_MESSAGE
     
     def _build_analysis_prompt(self, text: str, context: Optional[str]) -> str:
         prompt = f"Extract actionable tasks from this text:\n\n{text}"
@@ -114,9 +134,13 @@ class TaskAnalyzerService:
         elif any(word in text.lower() for word in ["review", "analyze", "report"]):
             category = "work"
         
+        description = text.strip()
+        if len(description) > self.FALLBACK_DESCRIPTION_LENGTH:
+            description = description[:self.FALLBACK_DESCRIPTION_LENGTH - 3].rstrip() + "..."
+        
         return TaskCreate(
             title=title,
-            description=text,
+            description=description,
             priority=priority,
             category=category,
             source_text=text,
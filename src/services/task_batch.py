@@ -0,0 +1,310 @@
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+from uuid import UUID
+import asyncio
+import json
+import re
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.infrastructure.database.postgres_client import SessionLocal, engine, get_read_session
+from src.services.task_cache import TaskCache
+from src.services.task_events import TaskChangeFeed
+from src.services.task_service import TaskService
+from src.schemas.batch import BatchOperation, BatchOperationResult, BatchResponse
+from src.schemas.task import TaskCreate, TaskUpdate
+from src.core.config import settings
+from src.core.exceptions import AppException
+from src.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from src.api.container import Container
+
+logger = get_logger(__name__)
+
+TASKS_PREFIX = f"{settings.API_V1_STR}/AI Tasks"
+STEP_TOGGLE_PATH = re.compile(r"^/steps/(?P<step_id>[^/]+)/toggle-completion$")
+TASK_PATH = re.compile(r"^/(?P<task_id>[^/]+)$")
+
+Handler = Callable[[TaskService], Awaitable[Tuple[int, Any]]]
+
+
+class TaskListQuery(BaseModel):
+    """Query parameters of GET /tasks, validated like the route does"""
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=20, ge=1, le=100)
+    category: Optional[str] = None
+    priority: Optional[str] = None
+    is_completed: Optional[bool] = None
+    order_by: str = Field(default="created_at", pattern="^(created_at|priority)$")
+    include_archived: bool = False
+
+
+class _DeferredTaskCache(TaskCache):
+    """
+    Task cache for an atomic batch: no read-through (results may include
+    uncommitted writes) and invalidations are held until the batch commits.
+    """
+    
+    def __init__(self, target: TaskCache):
+        self.cache = target.cache
+        self.ttl = target.ttl
+        self.target = target
+        self.task_ids: set = set()
+        self.invalidated = False
+    
+    async def task_key(self, task_id: UUID) -> Optional[str]:
+        return None
+    
+    async def list_key(self, params: Dict[str, Any]) -> Optional[str]:
+        return None
+    
+    async def lookup_task(self, task_id: UUID) -> Tuple[Optional[str], Optional[Any]]:
+        return None, None
+    
+    async def lookup_list(self, params: Dict[str, Any]) -> Tuple[Optional[str], Optional[Any]]:
+        return None, None
+    
+    async def invalidate(self, task_ids: Iterable[UUID] = ()) -> None:
+        self.task_ids.update(task_ids)
+        self.invalidated = True
+    
+    async def flush(self) -> None:
+        if self.invalidated:
+            await self.target.invalidate(self.task_ids)
+
+
+class _DeferredChangeFeed(TaskChangeFeed):
+    """Change feed for an atomic batch: events are published after commit"""
+    
+    def __init__(self, target: TaskChangeFeed):
+        self.target = target
+        self.pending: List[Tuple[tuple, dict]] = []
+    
+    async def publish(self, *args: Any, **kwargs: Any) -> None:
+        self.pending.append((args, kwargs))
+    
+    async def flush(self) -> None:
+        for args, kwargs in self.pending:
+            await self.target.publish(*args, **kwargs)
+
+
+class TaskBatchService:
+    """
+    Executes POST /batch: an ordered list of task operations in one request.
+    
+    Writes run in order on one session. In the default mode each operation
+    commits on its own and a failure only affects that operation; runs of
+    consecutive reads are executed concurrently by up to
+    BATCH_READ_CONCURRENCY workers, each with its own session (one of them
+    the request's), so a batch never holds more connections than that.
+    With atomic=True everything, reads included, runs
+    in order inside one transaction that is rolled back on the first failed
+    operation; cache invalidation and change events are only sent once it
+    has committed.
+    """
+    
+    def __init__(self, container: "Container", db: Session):
+        self.container = container
+        self.db = db
+    
+    async def execute(self, operations: List[BatchOperation], atomic: bool = False) -> BatchResponse:
+        resolved = [self._resolve(operation) for operation in operations]
+        if atomic:
+            return await self._execute_atomic(operations, resolved)
+        
+        service = self.container.task_service(self.db)
+        results: List[BatchOperationResult] = []
+        index = 0
+        while index < len(operations):
+            is_read, handler = resolved[index]
+            if not is_read:
+                results.append(await self._run(operations[index], handler, service))
+                index += 1
+                continue
+            
+            end = index
+            while end < len(operations) and resolved[end][0]:
+                end += 1
+            if end - index == 1:
+                results.append(await self._run(operations[index], handler, service))
+            else:
+                results.extend(await self._run_reads(operations[index:end], resolved[index:end], service))
+            index = end
+        
+        return BatchResponse(results=results, committed=True)
+    
+    async def _run_reads(
+        self,
+        operations: List[BatchOperation],
+        resolved: List[Tuple[bool, Handler]],
+        service: TaskService
+    ) -> List[BatchOperationResult]:
+        """Run reads concurrently on a bounded number of sessions"""
+        results: List[Optional[BatchOperationResult]] = [None] * len(operations)
+        pending = iter(range(len(operations)))
+        
+        async def worker(worker_service: TaskService) -> None:
+            for i in pending:
+                results[i] = await self._run(operations[i], resolved[i][1], worker_service)
+        
+        # Primary, so reads see the writes made earlier in this batch
+        sessions = [
+            get_read_session(prefer_primary=True)
+            for _ in range(min(settings.BATCH_READ_CONCURRENCY, len(operations)) - 1)
+        ]
+        try:
+            await asyncio.gather(
+                worker(service),
+                *(worker(self.container.task_service(db)) for db in sessions)
+            )
+        finally:
+            for db in sessions:
+                await run_in_threadpool(db.close)
+        return results
+    
+    async def _execute_atomic(
+        self,
+        operations: List[BatchOperation],
+        resolved: List[Tuple[bool, Handler]]
+    ) -> BatchResponse:
+        connection = await run_in_threadpool(engine.connect)
+        transaction = await run_in_threadpool(connection.begin)
+        # Repository commits only release a savepoint; the outer transaction
+        # decides whether the batch is kept
+        db = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+        cache = _DeferredTaskCache(self.container.task_cache)
+        events = _DeferredChangeFeed(self.container.task_events)
+        service = TaskService(db, analyzer=self.container.analyzer, cache=cache, events=events)
+        
+        results: List[BatchOperationResult] = []
+        try:
+            for operation, (_, handler) in zip(operations, resolved):
+                result = await self._run(operation, handler, service)
+                results.append(result)
+                if result.status >= 400:
+                    await run_in_threadpool(transaction.rollback)
+                    results.extend(
+                        BatchOperationResult(
+                            id=skipped.id,
+                            status=424,
+                            body={"detail": "Not executed: an earlier operation failed"}
+                        )
+                        for skipped in operations[len(results):]
+                    )
+                    return BatchResponse(results=results, committed=False)
+            
+            await run_in_threadpool(transaction.commit)
+        finally:
+            await run_in_threadpool(db.close)
+            await run_in_threadpool(connection.close)
+        
+        await cache.flush()
+        await events.flush()
+        return BatchResponse(results=results, committed=True)
+    
+    async def _run(
+        self,
+        operation: BatchOperation,
+        handler: Handler,
+        service: TaskService
+    ) -> BatchOperationResult:
+        try:
+            status, body = await handler(service)
+        except ValidationError as e:
+            status, body = 422, {"detail": json.loads(e.json(include_url=False))}
+        except AppException as e:
+            status, body = e.status_code, {
+                "error": e.error_code,
+                "message": str(e),
+                "details": e.details
+            }
+        except Exception as e:
+            logger.exception("Batch operation %s %s failed: %s", operation.method, operation.path, e)
+            # Leave the session usable for the following operations
+            await run_in_threadpool(service.repository.db.rollback)
+            status, body = 500, {
+                "error": "INTERNAL_SERVER_ERROR",
+                "message": "An unexpected error occurred"
+            }
+        return BatchOperationResult(id=operation.id, status=status, body=body)
+    
+    def _resolve(self, operation: BatchOperation) -> Tuple[bool, Handler]:
+        """Map an operation to (is_read, handler)"""
+        path, _, query = operation.path.partition("?")
+        if path.startswith(TASKS_PREFIX):
+            path = path[len(TASKS_PREFIX):]
+        path = path or "/"
+        method = operation.method
+        body = operation.body or {}
+        
+        if path == "/" and method == "GET":
+            return True, lambda service: self._list_tasks(service, query)
+        if path == "/" and method == "POST":
+            return False, lambda service: self._create_task(service, body)
+        
+        match = STEP_TOGGLE_PATH.match(path)
+        step_id = self._uuid(match.group("step_id")) if match else None
+        if step_id and method == "POST":
+            return False, lambda service: self._toggle_step(service, step_id)
+        
+        match = TASK_PATH.match(path)
+        task_id = self._uuid(match.group("task_id")) if match else None
+        if task_id and method == "GET":
+            return True, lambda service: self._get_task(service, task_id)
+        if task_id and method == "PATCH":
+            return False, lambda service: self._update_task(service, task_id, body)
+        if task_id and method == "DELETE":
+            return False, lambda service: self._delete_task(service, task_id)
+        
+        return False, self._unsupported
+    
+    @staticmethod
+    def _uuid(value: str) -> Optional[UUID]:
+        try:
+            return UUID(value)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    async def _unsupported(service: TaskService) -> Tuple[int, Any]:
+        return 400, {"detail": "Unsupported batch operation"}
+    
+    @staticmethod
+    async def _list_tasks(service: TaskService, query: str) -> Tuple[int, Any]:
+        params = TaskListQuery.model_validate(dict(parse_qsl(query)))
+        payload, _ = await service.list_tasks_payload(**params.model_dump())
+        return 200, payload
+    
+    @staticmethod
+    async def _get_task(service: TaskService, task_id: UUID) -> Tuple[int, Any]:
+        payload, _ = await service.get_task_payload(task_id)
+        if payload is None:
+            return 404, {"detail": "Task not found"}
+        return 200, payload
+    
+    @staticmethod
+    async def _create_task(service: TaskService, body: Dict[str, Any]) -> Tuple[int, Any]:
+        task = await service.create_task(TaskCreate.model_validate(body))
+        return 200, task.model_dump(mode="json")
+    
+    @staticmethod
+    async def _update_task(service: TaskService, task_id: UUID, body: Dict[str, Any]) -> Tuple[int, Any]:
+        task = await service.update_task(task_id, TaskUpdate.model_validate(body))
+        if task is None:
+            return 404, {"detail": "Task not found"}
+        return 200, task.model_dump(mode="json")
+    
+    @staticmethod
+    async def _toggle_step(service: TaskService, step_id: UUID) -> Tuple[int, Any]:
+        if not await service.toggle_step_completion(step_id):
+            return 404, {"detail": "Step not found"}
+        return 200, {"success": True}
+    
+    @staticmethod
+    async def _delete_task(service: TaskService, task_id: UUID) -> Tuple[int, Any]:
+        if not await service.delete_task(task_id):
+            return 404, {"detail": "Task not found"}
+        return 200, {"success": True}
@@ -0,0 +1,179 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID, uuid4
+import asyncio
+import hashlib
+import json
+import time
+
+from src.infrastructure.cache.redis import RedisCache
+from src.core.logging import get_logger
+from src.core.metrics import record_cache_lookup
+
+logger = get_logger(__name__)
+
+
+class TaskCache:
+    """
+    Read-through cache for serialized task responses.
+    
+    Each entry is stamped with the version token of its scope (the task, or
+    the task collection for lists). Every write replaces the version token of
+    the affected task(s) and of the task collection, so entries cached before
+    the write no longer match and are treated as misses. Version tokens are
+    random rather than incrementing so a lost or evicted version key can never
+    make an old entry valid again.
+    
+    Cache keys handed to callers are "<entry key>:<version>" strings; they
+    also serve as ETag sources. A lookup reads the version and the entry with
+    one MGET, so a cached response costs a single round trip.
+    
+    If a version token cannot be replaced after a write, entries cached
+    before the write would still look current. Those scopes are then neither
+    read from nor written to the cache by this worker until the replacement
+    is retried successfully, or until every entry older than the write has
+    expired.
+    
+    That bypass is best-effort: it is tracked per process, so other workers
+    keep serving the stale entries until the retry (or the entry TTL) catches
+    up. It is not shared through Redis because a marker there can only be
+    written when Redis accepts writes, and then the new version token could
+    have been written instead. Callers that must read their own writes should
+    not rely on the cache alone while Redis is failing.
+    """
+    
+    PREFIX = "task_cache"
+    COLLECTION = "tasks"
+    
+    INVALIDATE_ATTEMPTS = 3
+    # Minimum seconds between retries of failed invalidations
+    RETRY_INTERVAL = 1.0
+    
+    def __init__(self, cache: Optional[RedisCache] = None, ttl: Optional[int] = None):
+        self.cache = cache or RedisCache()
+        self.ttl = ttl
+        # Version key -> monotonic time of the write that failed to replace it.
+        # Local to this process; see the class docstring
+        self._unconfirmed: Dict[str, float] = {}
+        self._next_retry = 0.0
+    
+    def _version_key(self, scope: str) -> str:
+        return f"{self.PREFIX}:version:{scope}"
+    
+    async def _current_version(self, scope: str) -> Optional[str]:
+        """Get the version token for a scope, creating one if it does not exist"""
+        return await self.cache.get_or_set(self._version_key(scope), uuid4().hex, ttl=self.ttl)
+    
+    def _task_entry(self, task_id: UUID) -> Tuple[str, str]:
+        return f"task:{task_id}", f"{self.PREFIX}:task:{task_id}"
+    
+    def _list_entry(self, params: Dict[str, Any]) -> Tuple[str, str]:
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return self.COLLECTION, f"{self.PREFIX}:list:{digest}"
+    
+    async def _trusted(self, scope: str) -> bool:
+        """Whether entries of a scope may be served and stored"""
+        if self._unconfirmed:
+            await self._retry_invalidations()
+        return self._version_key(scope) not in self._unconfirmed
+    
+    async def _retry_invalidations(self) -> None:
+        now = time.monotonic()
+        if now < self._next_retry:
+            return
+        self._next_retry = now + self.RETRY_INTERVAL
+        
+        # Entries cached before those writes have expired by now
+        ttl = self.ttl or self.cache.default_ttl
+        for key, failed_at in list(self._unconfirmed.items()):
+            if now - failed_at >= ttl:
+                del self._unconfirmed[key]
+        
+        pending = dict(self._unconfirmed)
+        if pending and await self.cache.set_many({key: uuid4().hex for key in pending}, ttl=self.ttl):
+            for key, failed_at in pending.items():
+                # Unless another write failed on it in the meantime
+                if self._unconfirmed.get(key) == failed_at:
+                    del self._unconfirmed[key]
+            logger.info("Invalidated %s task cache scopes on retry", len(pending))
+    
+    async def _key(self, scope: str, entry: str) -> Optional[str]:
+        if not await self._trusted(scope):
+            return None
+        version = await self._current_version(scope)
+        if version is None:
+            return None
+        return f"{entry}:{version}"
+    
+    async def _lookup(self, scope: str, entry: str) -> Tuple[Optional[str], Optional[Any]]:
+        if not await self._trusted(scope):
+            return None, None
+        version, stored = await self.cache.mget([self._version_key(scope), entry])
+        if version is None:
+            # No version yet (or the cache is down): nothing cached can be current
+            key = await self._key(scope, entry)
+            if key is not None:
+                record_cache_lookup("task", False)
+            return key, None
+        value = self._unwrap(stored, version)
+        record_cache_lookup("task", value is not None)
+        return f"{entry}:{version}", value
+    
+    @staticmethod
+    def _unwrap(stored: Any, version: str) -> Optional[Any]:
+        if isinstance(stored, list) and len(stored) == 2 and stored[0] == version:
+            return stored[1]
+        return None
+    
+    async def task_key(self, task_id: UUID) -> Optional[str]:
+        """Cache key for a single task, or None if the cache is unavailable"""
+        return await self._key(*self._task_entry(task_id))
+    
+    async def list_key(self, params: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a list query, or None if the cache is unavailable"""
+        return await self._key(*self._list_entry(params))
+    
+    async def lookup_task(self, task_id: UUID) -> Tuple[Optional[str], Optional[Any]]:
+        """(cache key, cached value or None) for a task, in one round trip"""
+        return await self._lookup(*self._task_entry(task_id))
+    
+    async def lookup_list(self, params: Dict[str, Any]) -> Tuple[Optional[str], Optional[Any]]:
+        """(cache key, cached value or None) for a list query, in one round trip"""
+        return await self._lookup(*self._list_entry(params))
+    
+    async def get(self, key: Optional[str]) -> Optional[Any]:
+        if key is None:
+            return None
+        entry, version = key.rsplit(":", 1)
+        value = self._unwrap(await self.cache.get(entry), version)
+        record_cache_lookup("task", value is not None)
+        return value
+    
+    async def set(self, key: Optional[str], value: Any) -> None:
+        if key is None:
+            return
+        entry, version = key.rsplit(":", 1)
+        await self.cache.set(entry, [version, value], ttl=self.ttl)
+    
+    async def invalidate(self, task_ids: Iterable[UUID] = ()) -> None:
+        """
+        Invalidate the given tasks and every cached list.
+        Must be called after the write has been committed.
+        """
+        scopes = [f"task:{task_id}" for task_id in task_ids] + [self.COLLECTION]
+        versions = {self._version_key(scope): uuid4().hex for scope in scopes}
+        for attempt in range(self.INVALIDATE_ATTEMPTS):
+            if await self.cache.set_many(versions, ttl=self.ttl):
+                return
+            if attempt + 1 < self.INVALIDATE_ATTEMPTS:
+                await asyncio.sleep(0.05 * 2 ** attempt)
+        
+        logger.error("Failed to invalidate task cache scopes %s; bypassing the cache for them", scopes)
+        failed_at = time.monotonic()
+        for key in versions:
+            self._unconfirmed[key] = failed_at
+
+
+# Shared instance so requests reuse one Redis connection pool
+task_cache = TaskCache()
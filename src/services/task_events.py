@@ -0,0 +1,113 @@
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import UUID
+import asyncio
+
+from src.infrastructure.cache.redis import RedisCache
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Sent to a subscriber that fell behind (its backlog was dropped) or may have
+# missed events while the Redis subscription was down: re-fetch, then follow.
+RESYNC_EVENT = {"type": "resync", "task_id": None}
+
+
+class TaskChangeFeed:
+    """
+    Task change notifications over Redis pub/sub.
+    
+    Write paths publish small events (type + task id) on one channel, so every
+    API worker sees every change. Each worker holds a single subscription and
+    fans events out to its connected clients through bounded per-client
+    queues. Delivery never waits on a client: when a queue is full its backlog
+    is replaced by a resync event, so a slow consumer only ever delays itself.
+    """
+    
+    CHANNEL = "task_events"
+    
+    def __init__(self, cache: Optional[RedisCache] = None, queue_size: int = 100):
+        self.cache = cache or RedisCache()
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._reader: Optional[asyncio.Task] = None
+    
+    async def publish(self, event_type: str, task_id: Optional[UUID] = None, **data: Any) -> None:
+        """Publish a change; called after the write has been committed"""
+        event = {
+            "type": event_type,
+            "task_id": str(task_id) if task_id else None,
+            "at": datetime.utcnow().isoformat(),
+            **data
+        }
+        await self.cache.publish(self.CHANNEL, event)
+    
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        """Register a client; events are delivered to the yielded queue"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+    
+    @staticmethod
+    async def next_event(queue: asyncio.Queue, heartbeat: float) -> Optional[Dict[str, Any]]:
+        """Next event for a client, or None after `heartbeat` seconds of silence"""
+        try:
+            return await asyncio.wait_for(queue.get(), timeout=heartbeat)
+        except asyncio.TimeoutError:
+            return None
+    
+    async def _read(self) -> None:
+        """Forward messages from Redis to local subscribers while any are connected"""
+        resync = False
+        
+        def subscribed() -> None:
+            # Only once the new subscription is live: a client re-fetching
+            # earlier could miss events published before it was in place
+            nonlocal resync
+            if resync:
+                resync = False
+                self._dispatch(RESYNC_EVENT)
+        
+        while self._subscribers:
+            try:
+                async for event in self.cache.subscribe(self.CHANNEL, on_subscribed=subscribed):
+                    self._dispatch(event)
+                    if not self._subscribers:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Task change feed subscription error: %s", e)
+                resync = True
+                await asyncio.sleep(1)
+    
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop what it has not read yet and tell it to resync
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+    
+    async def close(self) -> None:
+        """Stop the Redis subscription of this worker"""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+
+
+# Shared instance so write paths reuse one Redis connection pool
+task_events = TaskChangeFeed()
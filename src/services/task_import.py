@@ -0,0 +1,190 @@
+from typing import AsyncIterator, List, Optional, Tuple, Union
+import asyncio
+import json
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.repositories.task_repository import TaskRepository
+from src.services.task_analyzer import TaskAnalyzerService
+from src.services.task_cache import TaskCache, task_cache
+from src.services.task_events import TaskChangeFeed, task_events
+from src.infrastructure.cache.redis import RedisCache
+from src.schemas.task import TaskCreate, TextInput, TaskImportError, TaskImportResult
+from src.utils.ndjson import iter_ndjson_lines
+from src.core.logging import get_logger
+from src.core.exceptions import AppException
+
+logger = get_logger(__name__)
+
+# Shared store for import checkpoints
+checkpoint_cache = RedisCache()
+
+
+class TaskImportService:
+    """
+    Streaming NDJSON task import.
+    
+    Each line is either a TaskCreate object or a raw text record
+    ({"text": ..., "context": ...}) that is turned into a task by the analyzer.
+    Lines are validated and written in batches, one transaction per batch.
+    After each commit the last committed line is stored as a checkpoint under
+    the caller's import id, so re-sending the same file resumes after it.
+    """
+    
+    MAX_REPORTED_ERRORS = 100
+    CHECKPOINT_TTL = 24 * 3600
+    
+    def __init__(
+        self,
+        db: Session,
+        analyzer: Optional[TaskAnalyzerService] = None,
+        cache: Optional[TaskCache] = None,
+        checkpoints: Optional[RedisCache] = None,
+        events: Optional[TaskChangeFeed] = None
+    ):
+        self.repository = TaskRepository(db)
+        self.analyzer = analyzer or TaskAnalyzerService()
+        self.cache = cache or task_cache
+        self.checkpoints = checkpoints or checkpoint_cache
+        self.events = events or task_events
+    
+    def _checkpoint_key(self, import_id: str) -> str:
+        return f"task_import:{import_id}:checkpoint"
+    
+    async def import_ndjson(
+        self,
+        chunks: AsyncIterator[bytes],
+        batch_size: int = 500,
+        analyze: bool = False,
+        analyze_concurrency: int = 4,
+        import_id: Optional[str] = None
+    ) -> TaskImportResult:
+        """Import tasks from an NDJSON byte stream"""
+        result = TaskImportResult()
+        resume_after = 0
+        if import_id:
+            resume_after = int(await self.checkpoints.get(self._checkpoint_key(import_id)) or 0)
+            result.last_committed_line = resume_after
+        
+        semaphore = asyncio.Semaphore(analyze_concurrency)
+        batch: List[Tuple[int, Union[TaskCreate, TextInput]]] = []
+        last_line = 0
+        
+        async for line_number, line in iter_ndjson_lines(chunks):
+            last_line = line_number
+            if line_number <= resume_after:
+                result.skipped += 1
+                continue
+            if line is None:
+                self._record_error(result, line_number, "Line too long")
+                continue
+            if not line.strip():
+                continue
+            
+            record = self._parse_line(result, line_number, line, analyze)
+            if record is not None:
+                batch.append((line_number, record))
+            
+            if len(batch) >= batch_size:
+                await self._flush(result, batch, line_number, semaphore, import_id)
+                batch = []
+        
+        await self._flush(result, batch, last_line, semaphore, import_id)
+        return result
+    
+    def _parse_line(
+        self,
+        result: TaskImportResult,
+        line_number: int,
+        line: bytes,
+        analyze: bool
+    ) -> Optional[Union[TaskCreate, TextInput]]:
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            self._record_error(result, line_number, f"Invalid JSON: {e}")
+            return None
+        
+        try:
+            if isinstance(data, dict) and "text" in data and "title" not in data:
+                if not analyze:
+                    self._record_error(result, line_number, "Raw text records require analyze=true")
+                    return None
+                return TextInput.model_validate(data)
+            return TaskCreate.model_validate(data)
+        except ValidationError as e:
+            self._record_error(result, line_number, str(e))
+            return None
+    
+    async def _analyze(
+        self,
+        result: TaskImportResult,
+        line_number: int,
+        text_input: TextInput,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[TaskCreate]:
+        async with semaphore:
+            try:
+                return await self.analyzer.analyze_text(text_input)
+            except Exception as e:
+                self._record_error(result, line_number, f"Analysis failed: {e}")
+                return None
+    
+    async def _flush(
+        self,
+        result: TaskImportResult,
+        batch: List[Tuple[int, Union[TaskCreate, TextInput]]],
+        through_line: int,
+        semaphore: asyncio.Semaphore,
+        import_id: Optional[str]
+    ) -> None:
+        """Analyze raw text records, then commit the batch and checkpoint"""
+        if batch:
+            tasks = await asyncio.gather(*(
+                self._analyze(result, line_number, record, semaphore)
+                if isinstance(record, TextInput) else self._passthrough(record)
+                for line_number, record in batch
+            ))
+            tasks = [task for task in tasks if task is not None]
+            
+            if tasks:
+                try:
+                    await run_in_threadpool(self.repository.create_many_with_steps, tasks)
+                except Exception as e:
+                    # Nothing from this batch was written; the checkpoint still
+                    # points at the last good batch, so the client can resume
+                    logger.error("Task import batch failed: %s", e)
+                    raise AppException(
+                        message="Import batch could not be written",
+                        error_code="IMPORT_BATCH_FAILED",
+                        status_code=500,
+                        details={
+                            "imported": result.imported,
+                            "last_committed_line": result.last_committed_line
+                        }
+                    )
+                result.imported += len(tasks)
+                await self.cache.invalidate()
+                # One event per batch; clients re-fetch lists on "bulk"
+                await self.events.publish("bulk", count=len(tasks))
+        
+        if through_line > result.last_committed_line:
+            result.last_committed_line = through_line
+            if import_id:
+                await self.checkpoints.set(
+                    self._checkpoint_key(import_id),
+                    through_line,
+                    ttl=self.CHECKPOINT_TTL
+                )
+    
+    @staticmethod
+    async def _passthrough(task: TaskCreate) -> TaskCreate:
+        return task
+    
+    def _record_error(self, result: TaskImportResult, line_number: int, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < self.MAX_REPORTED_ERRORS:
+            result.errors.append(TaskImportError(line=line_number, error=error))
+        else:
+            result.errors_truncated = True
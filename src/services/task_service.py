@@ -1,23 +1,47 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import csv
+import io
 from uuid import UUID
+import orjson
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.repositories.task_repository import TaskRepository
 from src.services.task_analyzer import TaskAnalyzerService
-from src.domain.models.task import TaskModel, TaskStepModel
+from src.services.task_cache import TaskCache, task_cache
+from src.services.task_events import TaskChangeFeed, task_events
+from src.domain.models.task import TaskModel
+from src.infrastructure.database.postgres_client import replica_engine
 from src.schemas.task import (
-    Task, TaskCreate, TaskUpdate, TextInput, 
-    TaskResponse, TaskListResponse
+    Task, TaskCreate, TaskUpdate, TextInput,
+    TaskResponse, TaskListResponse, TaskSearchResponse, TaskSource,
+    TaskStats, TaskStatsBreakdown, TaskDailyStats, task_to_dict
 )
+from src.core.exceptions import ValidationException
 from src.core.logging import get_logger
+from src.utils.etag import make_etag
 
 logger = get_logger(__name__)
 
 
 class TaskService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        analyzer: Optional[TaskAnalyzerService] = None,
+        cache: Optional[TaskCache] = None,
+        events: Optional[TaskChangeFeed] = None
+    ):
         self.repository = TaskRepository(db)
-        self.analyzer = TaskAnalyzerService()
+        self.analyzer = analyzer or TaskAnalyzerService()
+        self.cache = cache or task_cache
+        self.events = events or task_events
+    
+    @property
+    def _can_populate_cache(self) -> bool:
+        # A lagging replica could return rows older than the current cache
+        # version, so only results read from the primary are cached.
+        return replica_engine is None or self.repository.db.get_bind() is not replica_engine
     
     async def create_task_from_text(self, text_input: TextInput) -> TaskResponse:
         """Create task from text analysis"""
@@ -26,41 +50,112 @@ class TaskService:
             task_data = await self.analyzer.analyze_text(text_input)
             
             # Save to database
-            task_model = self.repository.create_with_steps(task_data)
+            task_model = await run_in_threadpool(self.repository.create_with_steps, task_data)
             
             # Convert to response
             task = Task.from_orm(task_model)
+            await self.cache.invalidate()
+            await self.events.publish("created", task.id)
             
             return TaskResponse(
                 task=task,
                 confidence=0.95  # Could be calculated based on LLM response
             )
         except Exception as e:
-            logger.error(f"Error creating task from text: {str(e)}")
+            logger.error("Error creating task from text: %s", e)
             raise
     
-    def create_task(self, task_data: TaskCreate) -> Task:
+    async def create_task(self, task_data: TaskCreate) -> Task:
         """Create task directly"""
-        task_model = self.repository.create_with_steps(task_data)
-        return Task.from_orm(task_model)
+        task_model = await run_in_threadpool(self.repository.create_with_steps, task_data)
+        task = Task.from_orm(task_model)
+        await self.cache.invalidate()
+        await self.events.publish("created", task.id)
+        return task
+    
+    async def get_task(self, task_id: UUID) -> Optional[Task]:
+        """Get single task (read-through cached)"""
+        payload, _ = await self.get_task_payload(task_id)
+        return Task.model_validate(payload) if payload is not None else None
+    
+    async def get_task_payload(self, task_id: UUID) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Get single task in its JSON form, and its ETag.
+        The ETag is None when the result cannot be tied to the current version
+        (cache unavailable, or rows read from a possibly lagging replica).
+        """
+        key, cached = await self.cache.lookup_task(task_id)
+        if cached is not None:
+            return cached, make_etag(key)
+        
+        payload = await run_in_threadpool(self._load_task, task_id)
+        if payload is None or key is None or not self._can_populate_cache:
+            return payload, None
+        
+        await self.cache.set(key, payload)
+        return payload, make_etag(key)
+    
+    async def task_etag(self, task_id: UUID) -> Optional[str]:
+        """Current ETag of a task, computed from its version without loading it"""
+        key = await self.cache.task_key(task_id)
+        return make_etag(key) if key else None
     
-    def get_task(self, task_id: UUID) -> Optional[Task]:
-        """Get single task"""
+    def _load_task(self, task_id: UUID) -> Optional[Dict[str, Any]]:
         task_model = self.repository.get_with_steps(task_id)
         if task_model:
-            return Task.from_orm(task_model)
+            return task_to_dict(task_model)
         return None
     
-    def list_tasks(
+    async def list_tasks(
         self,
         page: int = 1,
         page_size: int = 20,
         category: Optional[str] = None,
         priority: Optional[str] = None,
         is_completed: Optional[bool] = None,
-        order_by: str = "created_at"
+        order_by: str = "created_at",
+        include_archived: bool = False
     ) -> TaskListResponse:
-        """List tasks with pagination and filters"""
+        """List tasks with pagination and filters (read-through cached)"""
+        payload, _ = await self.list_tasks_payload(
+            page=page,
+            page_size=page_size,
+            category=category,
+            priority=priority,
+            is_completed=is_completed,
+            order_by=order_by,
+            include_archived=include_archived
+        )
+        return TaskListResponse.model_validate(payload)
+    
+    async def list_tasks_payload(self, **params) -> Tuple[Dict[str, Any], Optional[str]]:
+        """List tasks in JSON form and the ETag of the page (see get_task_payload)"""
+        key, cached = await self.cache.lookup_list(params)
+        if cached is not None:
+            return cached, make_etag(key)
+        
+        payload = await run_in_threadpool(self._load_task_list, **params)
+        if key is None or not self._can_populate_cache:
+            return payload, None
+        
+        await self.cache.set(key, payload)
+        return payload, make_etag(key)
+    
+    async def list_etag(self, **params) -> Optional[str]:
+        """Current ETag of a list page, computed from the collection version alone"""
+        key = await self.cache.list_key(params)
+        return make_etag(key) if key else None
+    
+    def _load_task_list(
+        self,
+        page: int,
+        page_size: int,
+        category: Optional[str],
+        priority: Optional[str],
+        is_completed: Optional[bool],
+        order_by: str,
+        include_archived: bool = False
+    ) -> Dict[str, Any]:
         skip = (page - 1) * page_size
         
         tasks = self.repository.list_tasks(
@@ -69,44 +164,287 @@ class TaskService:
             category=category,
             priority=priority,
             is_completed=is_completed,
-            order_by=order_by
+            order_by=order_by,
+            include_archived=include_archived
         )
         
         total = self.repository.count_tasks(
             category=category,
             priority=priority,
-            is_completed=is_completed
+            is_completed=is_completed,
+            include_archived=include_archived
         )
         
-        return TaskListResponse(
-            tasks=[Task.from_orm(t) for t in tasks],
+        return {
+            "tasks": [task_to_dict(t) for t in tasks],
+            "total": total,
+            "page": page,
+            "page_size": page_size
+        }
+    
+    async def get_task_source(self, task_id: UUID) -> Optional[TaskSource]:
+        """Get the raw source text of a task (loaded on demand)"""
+        source_text = await run_in_threadpool(self.repository.get_source_text, task_id)
+        if source_text is None:
+            return None
+        return TaskSource(task_id=task_id, source_text=source_text)
+    
+    @staticmethod
+    def _parse_cursor(cursor: str) -> Tuple[int, Optional[int], Optional[Tuple[int, int]]]:
+        """
+        Split a sync cursor into (floor, next floor, position).
+        "<floor>" starts a pass; "<floor>.<next floor>.<txid>.<seq>" continues
+        one after the change at (txid, seq).
+        """
+        try:
+            parts = [int(part) for part in (cursor or "0").split(".")]
+        except ValueError:
+            parts = []
+        if len(parts) == 1 and parts[0] >= 0:
+            return parts[0], None, None
+        if len(parts) == 4 and min(parts) >= 0:
+            return parts[0], parts[1], (parts[2], parts[3])
+        raise ValidationException("Invalid sync cursor", details={"since": cursor})
+    
+    def get_changes(self, since: str = "0", limit: int = 500) -> Dict[str, Any]:
+        """
+        Delta sync page in JSON form (TaskChanges shape): tasks changed and
+        tasks deleted after the `since` cursor, in change order.
+        
+        Must run on the primary. A cursor is a transaction id ("floor"): the
+        client has every change made by lower transaction ids. A pass starts
+        by reading the oldest running transaction id, which becomes the next
+        floor once the pass is complete: every lower transaction has finished,
+        so its changes are visible now and returned by this pass, and a
+        transaction that commits later has a higher id. Changes by
+        transactions from the next floor on may be sent twice.
+        """
+        floor, next_floor, after = self._parse_cursor(since)
+        if floor and floor <= self.repository.get_sync_horizon():
+            # Tombstones the client has not seen were compacted away
+            return {"tasks": [], "deleted": [], "cursor": "0", "has_more": True, "reset": True}
+        
+        if next_floor is None:
+            # Before the changes are read, so all lower transactions are visible to that read
+            next_floor = self.repository.get_snapshot_xmin()
+        tasks, tombstones = self.repository.list_changes(floor, after, limit)
+        changes = sorted(
+            [((task.change_txid, task.change_seq), task) for task in tasks] +
+            [((tombstone.change_txid, tombstone.change_seq), tombstone) for tombstone in tombstones],
+            key=lambda change: change[0]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        
+        if has_more:
+            txid, seq = changes[-1][0]
+            cursor = f"{floor}.{next_floor}.{txid}.{seq}"
+        else:
+            cursor = str(max(floor, next_floor))
+        
+        return {
+            "tasks": [task_to_dict(row) for _, row in changes if isinstance(row, TaskModel)],
+            "deleted": [str(row.task_id) for _, row in changes if not isinstance(row, TaskModel)],
+            "cursor": cursor,
+            "has_more": has_more,
+            "reset": False
+        }
+    
+    def get_stats(self, days: int = 30) -> TaskStats:
+        """
+        Dashboard stats from the incrementally maintained rollups.
+        Cost depends on the number of categories/priorities and days,
+        not on the number of tasks.
+        """
+        buckets = self.repository.stats.get_buckets()
+        daily = self.repository.stats.get_daily(days)
+        
+        by_category = {}
+        by_priority = {}
+        total = completed = step_count = steps_completed = 0
+        for bucket in buckets:
+            done = bucket.task_count if bucket.is_completed else 0
+            total += bucket.task_count
+            completed += done
+            step_count += bucket.step_count
+            steps_completed += bucket.steps_completed
+            for groups, key in ((by_category, bucket.category), (by_priority, bucket.priority)):
+                group_total, group_completed = groups.get(key, (0, 0))
+                groups[key] = (group_total + bucket.task_count, group_completed + done)
+        
+        def breakdown(groups):
+            return [
+                TaskStatsBreakdown(key=key, total=group_total, completed=group_completed)
+                for key, (group_total, group_completed) in sorted(groups.items())
+                if group_total
+            ]
+        
+        return TaskStats(
             total=total,
+            completed=completed,
+            open=total - completed,
+            completion_rate=completed / total if total else 0.0,
+            by_category=breakdown(by_category),
+            by_priority=breakdown(by_priority),
+            step_count=step_count,
+            steps_completed=steps_completed,
+            step_progress=steps_completed / step_count if step_count else 0.0,
+            daily=[
+                TaskDailyStats(day=row.day, created=row.created_count, completed=row.completed_count)
+                for row in daily
+            ]
+        )
+    
+    EXPORT_CSV_COLUMNS = [
+        "task_id", "title", "description", "priority", "category",
+        "is_completed", "is_archived", "created_at", "completed_at",
+        "step_order_index", "step_description", "step_is_completed"
+    ]
+    
+    def export_tasks(
+        self,
+        format: str = "ndjson",
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Export tasks as NDJSON (steps nested) or CSV (one row per step).
+        Yields one encoded chunk per database batch.
+        """
+        batches = self.repository.iter_export_batches(
+            category=category,
+            priority=priority,
+            is_completed=is_completed,
+            include_archived=include_archived,
+            include_source=format != "csv"
+        )
+        
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(self.EXPORT_CSV_COLUMNS)
+            for tasks in batches:
+                for task in tasks:
+                    task_columns = [
+                        task["id"], task["title"], task["description"], task["priority"],
+                        task["category"], task["is_completed"], task["is_archived"],
+                        task["created_at"].isoformat(),
+                        task["completed_at"].isoformat() if task["completed_at"] else ""
+                    ]
+                    if not task["steps"]:
+                        writer.writerow(task_columns + ["", "", ""])
+                    for step in task["steps"]:
+                        writer.writerow(task_columns + [
+                            step["order_index"], step["description"], step["is_completed"]
+                        ])
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            # Nothing was exported: still send the header row
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+            return
+        
+        # orjson, like the API responses: ISO-8601 datetimes. Lines carry
+        # source_text, so an exported file is valid /import input; imported
+        # tasks are new tasks (fresh ids and timestamps, not completed), the
+        # other exported fields are ignored by TaskCreate.
+        for tasks in batches:
+            yield b"".join(
+                orjson.dumps(task, option=orjson.OPT_APPEND_NEWLINE)
+                for task in tasks
+            )
+    
+    def search_tasks(
+        self,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False
+    ) -> TaskSearchResponse:
+        """Full-text search with ranking, combinable with list filters"""
+        return TaskSearchResponse.model_validate(self.search_tasks_payload(
+            query=query,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            category=category,
+            priority=priority,
+            is_completed=is_completed,
+            include_archived=include_archived
+        ))
+    
+    def search_tasks_payload(
+        self,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        is_completed: Optional[bool] = None,
+        include_archived: bool = False
+    ) -> Dict[str, Any]:
+        """Full-text search results in JSON form (TaskSearchResponse shape)"""
+        skip = (page - 1) * page_size
+        
+        tasks = self.repository.search_tasks(
+            query_text=query,
+            skip=skip,
+            limit=page_size,
+            category=category,
+            priority=priority,
+            is_completed=is_completed,
+            include_archived=include_archived
         )
+        
+        return {
+            "tasks": [task_to_dict(t) for t in tasks],
+            "query": query,
+            "page": page,
+            "page_size": page_size
+        }
     
-    def update_task(self, task_id: UUID, update_data: TaskUpdate) -> Optional[Task]:
+    async def update_task(self, task_id: UUID, update_data: TaskUpdate) -> Optional[Task]:
         """Update task"""
-        task_model = self.repository.update_task(task_id, update_data)
+        task_model = await run_in_threadpool(self.repository.update_task, task_id, update_data)
         if task_model:
-            return Task.from_orm(task_model)
+            task = Task.from_orm(task_model)
+            await self.cache.invalidate([task_id])
+            await self.events.publish("updated", task_id)
+            return task
         return None
     
-    def toggle_step_completion(self, step_id: UUID) -> bool:
+    async def toggle_step_completion(self, step_id: UUID) -> bool:
         """Toggle step completion status"""
+        task_id = await run_in_threadpool(self._toggle_step_completion, step_id)
+        if task_id is None:
+            return False
+        
+        await self.cache.invalidate([task_id])
+        await self.events.publish("step_toggled", task_id, step_id=str(step_id))
+        return True
+    
+    def _toggle_step_completion(self, step_id: UUID) -> Optional[UUID]:
         # Get current step status
-        step = self.repository.db.query(TaskStepModel)\
-            .filter(TaskStepModel.id == step_id).first()
+        step = self.repository.get_step(step_id)
         
         if not step:
-            return False
+            return None
         
         # Toggle completion
-        return self.repository.update_step_completion(
-            step_id, 
-            not step.is_completed
-        )
+        task_id = step.task_id
+        if not self.repository.update_step_completion(step_id, not step.is_completed):
+            return None
+        return task_id
     
-    def delete_task(self, task_id: UUID) -> bool:
+    async def delete_task(self, task_id: UUID) -> bool:
         """Delete task"""
-        return self.repository.delete(task_id)
\ No newline at end of file
+        success = await run_in_threadpool(self.repository.delete, task_id)
+        if success:
+            await self.cache.invalidate([task_id])
+            await self.events.publish("deleted", task_id)
+        return success
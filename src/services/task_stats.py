@@ -0,0 +1,34 @@
+import asyncio
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from src.infrastructure.database.postgres_client import SessionLocal
+from src.repositories.task_stats_repository import TaskStatsRepository
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def fold_task_stats() -> bool:
+    """Fold pending stats deltas into the rollups (see TaskStatsRepository)"""
+    db = SessionLocal()
+    try:
+        return TaskStatsRepository(db).fold_deltas()
+    finally:
+        db.close()
+
+
+async def fold_task_stats_periodically(interval: Optional[float] = None) -> None:
+    """
+    Fold stats deltas every `interval` seconds; runs until cancelled. Every
+    worker runs one, and whichever gets the lock first does the fold.
+    """
+    interval = interval or settings.TASK_STATS_FOLD_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(fold_task_stats)
+        except Exception as e:
+            logger.error("Failed to fold task stats deltas: %s", e)
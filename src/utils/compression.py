@@ -0,0 +1,44 @@
+from typing import Tuple
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
+
+def compress_bytes(data: bytes, zstd_level: int = ZSTD_LEVEL) -> Tuple[str, bytes]:
+    """
+    Compress bytes, returning (codec, payload).
+    zstd is used when available, zlib otherwise; the codec is stored next to
+    the payload so either can always be read back.
+    """
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=zstd_level).compress(data)
+    return "zlib", zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress_bytes(codec: str, payload: bytes) -> bytes:
+    """Decompress a payload produced by compress_bytes"""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed data")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    if codec == "raw":
+        return payload
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """Compress text, returning (codec, payload) (see compress_bytes)"""
+    return compress_bytes(text.encode("utf-8"))
+
+
+def decompress_text(codec: str, payload: bytes) -> str:
+    """Decompress a payload produced by compress_text"""
+    return decompress_bytes(codec, payload).decode("utf-8")
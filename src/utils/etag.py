@@ -0,0 +1,25 @@
+from typing import Optional
+import hashlib
+
+
+def make_etag(value: str) -> str:
+    """Build a strong ETag from an opaque version string"""
+    return '"' + hashlib.sha1(value.encode()).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    Uses weak comparison as required for If-None-Match (RFC 7232 3.2).
+    "*" is not honoured since existence is not known without loading the row.
+    """
+    if not if_none_match or not etag:
+        return False
+    
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,36 @@
+from typing import AsyncIterator, Optional, Tuple
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = 1024 * 1024
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into NDJSON lines as it arrives.
+    
+    Yields (line_number, line) with 1-based line numbers. Lines longer than
+    max_line_bytes are yielded as None and their remaining bytes discarded,
+    so memory stays bounded by one chunk plus one line.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+    
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                if len(buffer) > max_line_bytes:
+                    # Drop the partial line; report it once its end arrives
+                    buffer = b""
+                    oversized = True
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            line_number += 1
+            yield line_number, None if oversized else line
+            oversized = False
+    
+    if buffer or oversized:
+        line_number += 1
+        yield line_number, None if oversized else buffer
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from uuid import UUID
+import os
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MS = timedelta(milliseconds=1)
+
+
+def uuid7(at: datetime) -> UUID:
+    """
+    Time-ordered UUID (version 7, RFC 9562) carrying `at` (naive UTC) to the
+    millisecond, followed by 74 random bits
+    """
+    millis = (at - EPOCH) // ONE_MS
+    value = (millis << 80) | int.from_bytes(os.urandom(10), "big")
+    # Version 7 and the RFC 4122 variant
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return UUID(int=value)
+
+
+def uuid7_time_range(value: UUID) -> Optional[Tuple[datetime, datetime]]:
+    """
+    [start, end) of the millisecond a version 7 UUID was made for, e.g. to
+    find the row's created_at; None for other UUID versions
+    """
+    if value.version != 7:
+        return None
+    start = EPOCH + (value.int >> 80) * ONE_MS
+    return start, start + ONE_MS
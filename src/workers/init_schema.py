@@ -0,0 +1,17 @@
+"""
+Create tables and upcoming partitions, then exit.
+
+API workers started with FAST_START=true skip this in their startup hook, so
+run it once per deploy before they start:
+
+    python -m src.workers.init_schema
+"""
+from src.core.logging import get_logger
+from src.infrastructure.database.postgres_client import init_db
+
+logger = get_logger(__name__)
+
+
+if __name__ == "__main__":
+    init_db()
+    logger.info("Database schema is up to date")
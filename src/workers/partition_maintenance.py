@@ -0,0 +1,292 @@
+"""
+Partition maintenance for the tasks and task_steps tables, plus archival,
+compaction of delta sync tombstones and cleanup of orphaned source texts.
+
+Run periodically (e.g. daily from cron):
+
+    python -m src.workers.partition_maintenance
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import List
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    """First day of the month `offset` months after `day`"""
+    month_index = day.year * 12 + day.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_month_partition(
+    engine: Engine,
+    parent: str,
+    default: str,
+    name: str,
+    start: date,
+    end: date,
+    columns: List[str]
+) -> None:
+    """
+    Create one monthly partition in its own transaction. Rows of that month
+    which already landed in the default partition (the job did not run in
+    time) are moved into it: Postgres refuses to create a partition while the
+    default one holds rows belonging to it.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+            return
+        # Keeps new rows out of the default partition until this commits
+        conn.execute(text(f"LOCK TABLE {parent} IN ACCESS EXCLUSIVE MODE"))
+        
+        create = f"CREATE TABLE {name} PARTITION OF {parent} " \
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        in_range = f"created_at >= '{start.isoformat()}' AND created_at < '{end.isoformat()}'"
+        misplaced = conn.execute(text(f"SELECT count(*) FROM {default} WHERE {in_range}")).scalar()
+        if not misplaced:
+            conn.execute(text(create))
+            return
+        
+        column_list = ", ".join(columns)
+        conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {default}"))
+        conn.execute(text(create))
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING {column_list}) "
+            f"INSERT INTO {name} ({column_list}) SELECT {column_list} FROM moved"
+        ))
+        conn.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {default} DEFAULT"))
+    logger.warning("Moved %s rows from %s into the new partition %s", misplaced, default, name)
+
+
+def ensure_partitions(engine: Engine, months_ahead: int = None) -> None:
+    """
+    Create the partition tree and monthly partitions from the current month
+    up to `months_ahead` months into the future. Idempotent.
+    
+    Each partition is created in its own transaction, so one failure does not
+    prevent the others; failures are raised together once all were tried.
+    """
+    from src.domain.models.task import TaskModel, TaskStepModel
+    
+    if months_ahead is None:
+        months_ahead = settings.TASK_PARTITION_MONTHS_AHEAD
+    
+    with engine.begin() as conn:
+        for statement in [
+            "CREATE TABLE IF NOT EXISTS tasks_hot PARTITION OF tasks "
+            "FOR VALUES IN (false) PARTITION BY RANGE (created_at)",
+            "CREATE TABLE IF NOT EXISTS tasks_cold PARTITION OF tasks FOR VALUES IN (true)",
+            # Catch-alls so inserts never fail if the job has not run in time
+            "CREATE TABLE IF NOT EXISTS tasks_hot_default PARTITION OF tasks_hot DEFAULT",
+            "CREATE TABLE IF NOT EXISTS task_steps_default PARTITION OF task_steps DEFAULT",
+        ]:
+            conn.execute(text(statement))
+    
+    # Generated columns are recomputed when rows are moved
+    trees = [
+        ("tasks_hot", "tasks_hot_default", "tasks_hot_p", TaskModel.__table__),
+        ("task_steps", "task_steps_default", "task_steps_p", TaskStepModel.__table__),
+    ]
+    today = date.today()
+    failed = []
+    for offset in range(months_ahead + 1):
+        start = _month_start(today, offset)
+        end = _month_start(today, offset + 1)
+        for parent, default, prefix, table in trees:
+            name = f"{prefix}{start.strftime('%Y%m')}"
+            columns = [column.name for column in table.columns if column.computed is None]
+            try:
+                _create_month_partition(engine, parent, default, name, start, end, columns)
+            except Exception as e:
+                logger.error("Failed to create partition %s: %s", name, e)
+                failed.append(name)
+    
+    if failed:
+        raise RuntimeError(f"Failed to create partitions: {', '.join(failed)}")
+    logger.info("Ensured task partitions through %s", _month_start(today, months_ahead))
+
+
+ARCHIVE_BATCH_SQL = text("""
+    UPDATE tasks SET
+        is_archived = true,
+        updated_at = now() AT TIME ZONE 'utc',
+        change_seq = nextval('task_change_seq'),
+        change_txid = txid_current()
+    WHERE is_archived = false
+      AND id IN (
+        SELECT id FROM tasks
+        WHERE is_archived = false
+          AND is_completed = true
+          AND completed_at < :cutoff
+        LIMIT :batch_size
+      )
+    RETURNING id
+""")
+
+
+def archive_completed_tasks(
+    engine: Engine,
+    older_than_days: int = None,
+    batch_size: int = None,
+    archived: List[UUID] = None
+) -> List[UUID]:
+    """
+    Move tasks completed more than `older_than_days` ago into the cold
+    partition. Works in short batches so no long lock is held on the hot
+    partitions. Returns the ids of archived tasks; ids of committed batches
+    are also appended to `archived` as they go, so a caller still sees them
+    if a later batch fails.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TASK_ARCHIVE_AFTER_DAYS
+    if batch_size is None:
+        batch_size = settings.TASK_ARCHIVE_BATCH_SIZE
+    
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    if archived is None:
+        archived = []
+    while True:
+        with engine.begin() as conn:
+            ids = conn.execute(
+                ARCHIVE_BATCH_SQL,
+                {"cutoff": cutoff, "batch_size": batch_size}
+            ).scalars().all()
+        archived.extend(ids)
+        if len(ids) < batch_size:
+            break
+    
+    logger.info("Archived %s completed tasks older than %s days", len(archived), older_than_days)
+    return archived
+
+
+# Source texts no task references, not (re)used within the grace period
+DELETE_ORPHANED_SOURCE_TEXTS_SQL = text("""
+    DELETE FROM source_texts
+    WHERE hash IN (
+        SELECT s.hash FROM source_texts s
+        WHERE s.created_at < :cutoff
+          AND NOT EXISTS (SELECT 1 FROM tasks t WHERE t.source_hash = s.hash)
+        LIMIT :batch_size
+    )
+    RETURNING hash
+""")
+
+
+def delete_orphaned_source_texts(
+    engine: Engine,
+    grace_hours: int = None,
+    batch_size: int = None
+) -> int:
+    """
+    Delete source texts left behind by deleted tasks. Texts are shared
+    between tasks, so they are swept by reference rather than deleted with
+    a task. Returns the number of texts deleted.
+    """
+    if grace_hours is None:
+        grace_hours = settings.SOURCE_TEXT_ORPHAN_GRACE_HOURS
+    if batch_size is None:
+        batch_size = settings.TASK_ARCHIVE_BATCH_SIZE
+    
+    cutoff = datetime.utcnow() - timedelta(hours=grace_hours)
+    deleted = 0
+    while True:
+        with engine.begin() as conn:
+            count = len(conn.execute(
+                DELETE_ORPHANED_SOURCE_TEXTS_SQL,
+                {"cutoff": cutoff, "batch_size": batch_size}
+            ).all())
+        deleted += count
+        if count < batch_size:
+            break
+    
+    logger.info("Deleted %s orphaned source texts", deleted)
+    return deleted
+
+
+# Delete old tombstones and advance the sync horizon past them, in one statement
+COMPACT_TOMBSTONES_SQL = text("""
+    WITH compacted AS (
+        DELETE FROM task_tombstones
+        WHERE deleted_at < :cutoff
+        RETURNING change_txid
+    )
+    INSERT INTO task_sync_horizon (id, compacted_through)
+    SELECT 1, max(change_txid) FROM compacted
+    HAVING count(*) > 0
+    ON CONFLICT (id) DO UPDATE SET compacted_through = GREATEST(
+        task_sync_horizon.compacted_through, EXCLUDED.compacted_through
+    )
+""")
+
+
+def compact_tombstones(engine: Engine, older_than_days: int = None) -> None:
+    """
+    Drop delete tombstones older than the retention period. Delta sync
+    clients with a cursor from before the horizon are told to resync.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TASK_TOMBSTONE_RETENTION_DAYS
+    
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    with engine.begin() as conn:
+        conn.execute(COMPACT_TOMBSTONES_SQL, {"cutoff": cutoff})
+    logger.info("Compacted task tombstones older than %s days", older_than_days)
+
+
+def fold_stats_deltas(engine: Engine) -> None:
+    """Fold pending stats deltas, in case no API worker is doing it"""
+    from src.repositories.task_stats_repository import TaskStatsRepository
+    
+    with Session(engine) as db:
+        TaskStatsRepository(db).fold_deltas()
+
+
+def run_maintenance(engine: Engine = None) -> None:
+    """
+    Create upcoming partitions, fold stats deltas, compact tombstones, delete
+    orphaned source texts, archive old tasks and notify readers.
+    A failing step does not stop the others; failures are raised at the end.
+    """
+    if engine is None:
+        from src.infrastructure.database.postgres_client import engine
+    
+    failed = []
+    
+    def step(job, *args, **kwargs):
+        try:
+            return job(*args, **kwargs)
+        except Exception:
+            logger.exception("Maintenance step %s failed", job.__name__)
+            failed.append(job.__name__)
+    
+    step(ensure_partitions, engine)
+    step(fold_stats_deltas, engine)
+    step(compact_tombstones, engine)
+    step(delete_orphaned_source_texts, engine)
+    # Batches committed before a failure still need their readers notified
+    archived: List[UUID] = []
+    step(archive_completed_tasks, engine, archived=archived)
+    if archived:
+        from src.services.task_cache import task_cache
+        from src.services.task_events import task_events
+        
+        async def notify():
+            await task_cache.invalidate(archived)
+            await task_events.publish("bulk", count=len(archived))
+        
+        asyncio.run(notify())
+    
+    if failed:
+        raise RuntimeError(f"Maintenance steps failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    run_maintenance()